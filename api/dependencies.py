@@ -1,13 +1,20 @@
-"""Engine singleton dependency."""
+"""Engine singleton and simulation concurrency dependencies.
 
-from functools import lru_cache
+Both objects are created once in the app lifespan and stored on app.state.
+"""
+
+import asyncio
+
+from fastapi import Request
 
 from ml2.engine import SimulationEngine
 
 
-@lru_cache(maxsize=1)
-def get_engine() -> SimulationEngine:
-    """Create and cache a single SimulationEngine instance."""
-    engine = SimulationEngine()
-    engine.load_baseline()
-    return engine
+def get_engine(request: Request) -> SimulationEngine:
+    """Shared SimulationEngine, pre-warmed with the baseline at startup."""
+    return request.app.state.engine
+
+
+def get_simulation_limiter(request: Request) -> asyncio.Semaphore:
+    """Semaphore bounding how many simulations run in worker threads at once."""
+    return request.app.state.simulation_limiter
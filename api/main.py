@@ -1,18 +1,24 @@
 """FastAPI application entry point."""
 
+import asyncio
+import os
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from api.dependencies import get_engine
+from api.responses import ORJSONResponse
 from api.routes import export, instruments, simulate
+from ml2.engine import SimulationEngine
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    """Pre-load the engine on startup."""
-    get_engine()
+    """Pre-load the engine and size the simulation limiter on startup."""
+    engine = SimulationEngine()
+    engine.load_baseline()
+    app.state.engine = engine
+    app.state.simulation_limiter = asyncio.Semaphore(os.cpu_count() or 1)
     yield
 
 
@@ -21,14 +27,20 @@ app = FastAPI(
     description="Macroeconomic simulation engine for Belgian fiscal policy experiments",
     version="0.1.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
+# Explicit allowlists: the frontend only issues GET/POST with a JSON body.
+CORS_ORIGINS = ("http://localhost:5173", "http://127.0.0.1:5173")
+CORS_METHODS = ("GET", "POST", "OPTIONS")
+CORS_HEADERS = ("Content-Type",)
+
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["http://localhost:5173", "http://127.0.0.1:5173"],
+    allow_origins=CORS_ORIGINS,
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=CORS_METHODS,
+    allow_headers=CORS_HEADERS,
 )
 
 app.include_router(simulate.router, tags=["simulation"])
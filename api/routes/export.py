@@ -1,27 +1,51 @@
 """Export endpoints: CSV and Excel download."""
 
+import asyncio
+import csv
 import io
+import tempfile
+from collections.abc import AsyncIterator
+from typing import IO
 
+import numpy as np
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import StreamingResponse
+from xlsxwriter import Workbook
 
-from api.dependencies import get_engine
+from api import xlsx
+from api.dependencies import get_engine, get_simulation_limiter
 from api.schemas import SimulationRequest
-from ml2.engine import SimulationEngine
+from ml2.engine import SimulationEngine, SimulationOutput
 
 router = APIRouter()
 
 
-def _build_csv(engine: SimulationEngine, instruments: dict[str, float], name: str) -> str:
-    """Run simulation and format results as CSV."""
-    result = engine.simulate(instrument_values=instruments or None, name=name)
+def _significant_impacts(result: SimulationOutput) -> list[tuple[str, list[float]]]:
+    """(variable, values) for impact rows with any |value| > 0.001."""
+    impacts = result.impacts
+    mask = np.any(np.abs(impacts.data) > 0.001, axis=1)
+    variables = [var for var, keep in zip(impacts.variables, mask) if keep]
+    return list(zip(variables, impacts.data[mask].tolist()))
 
-    lines = [f"# ML2 Simulation: {result.name}"]
-    lines.append(f"# Years: {result.years[0]}-{result.years[-1]}")
-    lines.append("")
+
+async def _csv_row_iter(result: SimulationOutput) -> AsyncIterator[bytes]:
+    """Yield simulation results as CSV, one UTF-8 encoded line at a time."""
+    buf = io.StringIO()
+    writer = csv.writer(buf, lineterminator="\n")
+
+    def row(cells: list) -> bytes:
+        buf.seek(0)
+        buf.truncate()
+        writer.writerow(cells)
+        return buf.getvalue().encode()
+
+    yield f"# ML2 Simulation: {result.name}\n".encode()
+    yield f"# Years: {result.years[0]}-{result.years[-1]}\n".encode()
+    yield b"\n"
 
     # Key indicators
-    lines.append("Indicator," + ",".join(str(y) for y in result.years))
+    yield row(["Indicator", *result.years])
     for label, vals in [
         ("GDP Growth (%) - Baseline", result.baseline_indicators.gdp_growth),
         ("GDP Growth (%) - Scenario", result.scenario_indicators.gdp_growth),
@@ -32,81 +56,142 @@ def _build_csv(engine: SimulationEngine, instruments: dict[str, float], name: st
         ("Unemployment (%) - Baseline", result.baseline_indicators.unemployment),
         ("Unemployment (%) - Scenario", result.scenario_indicators.unemployment),
     ]:
-        lines.append(label + "," + ",".join(f"{v:.2f}" for v in vals))
+        yield row([label, *(f"{v:.2f}" for v in vals)])
 
-    lines.append("")
-    lines.append("# Impacts (% deviation from baseline)")
-    for var, yr_dict in result.impacts.items():
-        vals = [yr_dict.get(y, 0.0) for y in result.years]
-        if any(abs(v) > 0.001 for v in vals):
-            lines.append(var + "," + ",".join(f"{v:.4f}" for v in vals))
-
-    return "\n".join(lines)
+    yield b"\n"
+    yield b"# Impacts (% deviation from baseline)\n"
+    for var, vals in _significant_impacts(result):
+        yield row([var, *(f"{v:.4f}" for v in vals)])
 
 
 @router.post("/export/csv")
-def export_csv(
+async def export_csv(
     request: SimulationRequest,
     engine: SimulationEngine = Depends(get_engine),
+    limiter: asyncio.Semaphore = Depends(get_simulation_limiter),
 ) -> StreamingResponse:
     """Export simulation results as CSV."""
     try:
-        csv_content = _build_csv(engine, request.instruments, request.name)
+        async with limiter:
+            result = await run_in_threadpool(
+                engine.simulate,
+                instrument_values=request.instruments or None,
+                name=request.name,
+            )
     except ValueError as e:
         raise HTTPException(status_code=422, detail=str(e))
 
     return StreamingResponse(
-        io.BytesIO(csv_content.encode("utf-8")),
+        _csv_row_iter(result),
         media_type="text/csv",
         headers={"Content-Disposition": f"attachment; filename=ml2_{request.name}.csv"},
     )
 
 
+def _excel_sheets(result: SimulationOutput) -> list[xlsx.Sheet]:
+    """(title, header, rows) for each sheet of the Excel export."""
+    base, scen = result.baseline_indicators, result.scenario_indicators
+    sheets: list[xlsx.Sheet] = [(
+        "Indicators",
+        [
+            "Year",
+            "GDP Growth (Baseline)",
+            "GDP Growth (Scenario)",
+            "Inflation (Baseline)",
+            "Inflation (Scenario)",
+            "Deficit/GDP (Baseline)",
+            "Deficit/GDP (Scenario)",
+            "Unemployment (Baseline)",
+            "Unemployment (Scenario)",
+        ],
+        list(zip(
+            result.years,
+            base.gdp_growth, scen.gdp_growth,
+            base.inflation, scen.inflation,
+            base.deficit_ratio, scen.deficit_ratio,
+            base.unemployment, scen.unemployment,
+        )),
+    )]
+
+    # Impacts sheet
+    impact_rows = [(var, *vals) for var, vals in _significant_impacts(result)]
+    if impact_rows:
+        sheets.append(
+            ("Impacts", ["Variable", *(str(y) for y in result.years)], impact_rows)
+        )
+
+    return sheets
+
+
+def _write_workbook(sheets: list[xlsx.Sheet]) -> IO[bytes]:
+    """The sheets as an .xlsx in a temporary file, rewound for reading.
+
+    constant_memory flushes each row to xlsxwriter's temporary files as soon as
+    the next one starts, so rows must be written strictly top to bottom within
+    each sheet; the zip itself is assembled in the file, so no sheet is held in
+    memory. (in_memory would switch constant_memory off.)
+    """
+    out = tempfile.TemporaryFile()  # noqa: SIM115 - closed by the caller (_iter_file)
+    try:
+        wb = Workbook(out, {"constant_memory": True, "nan_inf_to_errors": True})
+        bold = wb.add_format({"bold": True})
+        for title, header, rows in sheets:
+            ws = wb.add_worksheet(title)
+            ws.write_row(0, 0, header, bold)
+            for r, row in enumerate(rows, start=1):
+                ws.write_row(r, 0, row)
+        wb.close()
+    except BaseException:
+        out.close()
+        raise
+    out.seek(0)
+    return out
+
+
+def _build_excel(
+    engine: SimulationEngine, request: SimulationRequest, fast: bool
+) -> IO[bytes]:
+    """Simulate and write the workbook, rewound for reading; run in the threadpool."""
+    result = engine.simulate(
+        instrument_values=request.instruments or None,
+        name=request.name,
+    )
+    sheets = _excel_sheets(result)
+    if fast:
+        return io.BytesIO(xlsx.build_workbook(sheets))
+    return _write_workbook(sheets)
+
+
+async def _iter_file(f: IO[bytes], chunk_size: int = 1024 * 1024) -> AsyncIterator[bytes]:
+    """Read f in large chunks off the event loop, closing it at the end."""
+    try:
+        while chunk := await run_in_threadpool(f.read, chunk_size):
+            yield chunk
+    finally:
+        f.close()
+
+
 @router.post("/export/excel")
-def export_excel(
+async def export_excel(
     request: SimulationRequest,
+    fast: bool = False,
     engine: SimulationEngine = Depends(get_engine),
+    limiter: asyncio.Semaphore = Depends(get_simulation_limiter),
 ) -> StreamingResponse:
-    """Export simulation results as Excel."""
-    import pandas as pd
+    """Export simulation results as Excel.
 
+    ``?fast=1`` writes the sheet XML directly instead of going through
+    xlsxwriter.
+    """
     try:
-        result = engine.simulate(instrument_values=request.instruments or None, name=request.name)
+        async with limiter:
+            # The workbook build is CPU and disk work too; keep it off the event loop
+            workbook = await run_in_threadpool(_build_excel, engine, request, fast)
     except ValueError as e:
         raise HTTPException(status_code=422, detail=str(e))
 
-    buf = io.BytesIO()
-    with pd.ExcelWriter(buf, engine="openpyxl") as writer:
-        # Key indicators sheet
-        ind_data = {
-            "Year": result.years,
-            "GDP Growth (Baseline)": result.baseline_indicators.gdp_growth,
-            "GDP Growth (Scenario)": result.scenario_indicators.gdp_growth,
-            "Inflation (Baseline)": result.baseline_indicators.inflation,
-            "Inflation (Scenario)": result.scenario_indicators.inflation,
-            "Deficit/GDP (Baseline)": result.baseline_indicators.deficit_ratio,
-            "Deficit/GDP (Scenario)": result.scenario_indicators.deficit_ratio,
-            "Unemployment (Baseline)": result.baseline_indicators.unemployment,
-            "Unemployment (Scenario)": result.scenario_indicators.unemployment,
-        }
-        pd.DataFrame(ind_data).to_excel(writer, sheet_name="Indicators", index=False)
-
-        # Impacts sheet
-        impact_rows = []
-        for var, yr_dict in result.impacts.items():
-            vals = [yr_dict.get(y, 0.0) for y in result.years]
-            if any(abs(v) > 0.001 for v in vals):
-                impact_rows.append({"Variable": var, **{str(y): v for y, v in zip(result.years, vals)}})
-        if impact_rows:
-            pd.DataFrame(impact_rows).to_excel(writer, sheet_name="Impacts", index=False)
-
-        # Levels sheet
-        for var, yr_dict in result.levels.items():
-            pass  # included in impacts sheet context
-
-    buf.seek(0)
     return StreamingResponse(
-        buf,
+        _iter_file(workbook),
         media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
         headers={"Content-Disposition": f"attachment; filename=ml2_{request.name}.xlsx"},
     )
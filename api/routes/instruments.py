@@ -1,6 +1,9 @@
 """Instrument endpoints: GET /instruments."""
 
-from fastapi import APIRouter, Depends
+from weakref import WeakKeyDictionary
+
+from fastapi import APIRouter, Depends, Response
+from pydantic import TypeAdapter
 
 from api.dependencies import get_engine
 from api.schemas import InstrumentSpecResponse
@@ -8,10 +11,18 @@ from ml2.engine import SimulationEngine
 
 router = APIRouter()
 
+_SPECS_ADAPTER = TypeAdapter(list[InstrumentSpecResponse])
+# Encoded response body per engine; the specs are fixed once the engine is built
+_SPECS_JSON: WeakKeyDictionary[SimulationEngine, bytes] = WeakKeyDictionary()
+
 
 @router.get("/instruments", response_model=list[InstrumentSpecResponse])
 def get_instruments(
     engine: SimulationEngine = Depends(get_engine),
-) -> list[InstrumentSpecResponse]:
+) -> Response:
     """Get all available policy instrument specifications."""
-    return engine.get_instrument_specs()
+    body = _SPECS_JSON.get(engine)
+    if body is None:
+        specs = _SPECS_ADAPTER.validate_python(engine.get_instrument_specs())
+        body = _SPECS_JSON[engine] = _SPECS_ADAPTER.dump_json(specs)
+    return Response(body, media_type="application/json")
@@ -1,11 +1,14 @@
 """Simulation endpoints: POST /simulate, GET /baseline."""
 
-from fastapi import APIRouter, Depends, HTTPException
+import asyncio
 
-from api.dependencies import get_engine
+from fastapi import APIRouter, Depends, HTTPException, Response
+from fastapi.concurrency import run_in_threadpool
+
+from api.dependencies import get_engine, get_simulation_limiter
+from api.responses import ORJSONResponse
 from api.schemas import (
     BaselineResponse,
-    ConvergenceInfo,
     KeyIndicatorsResponse,
     SimulationRequest,
     SimulationResponse,
@@ -16,64 +19,47 @@ router = APIRouter()
 
 
 @router.post("/simulate", response_model=SimulationResponse)
-def run_simulation(
+async def run_simulation(
     request: SimulationRequest,
     engine: SimulationEngine = Depends(get_engine),
-) -> SimulationResponse:
+    limiter: asyncio.Semaphore = Depends(get_simulation_limiter),
+) -> ORJSONResponse:
     """Run a policy simulation with given instrument values."""
     try:
-        result = engine.simulate(
-            instrument_values=request.instruments if request.instruments else None,
-            name=request.name,
-        )
+        async with limiter:
+            result = await run_in_threadpool(
+                engine.simulate,
+                instrument_values=request.instruments if request.instruments else None,
+                name=request.name,
+            )
     except ValueError as e:
         raise HTTPException(status_code=422, detail=str(e))
 
-    # Convert int year keys to string for JSON serialization
-    impacts_str = {
-        var: {str(yr): val for yr, val in yr_dict.items()}
-        for var, yr_dict in result.impacts.items()
-    }
-    levels_str = {
-        var: {str(yr): val for yr, val in yr_dict.items()}
-        for var, yr_dict in result.levels.items()
-    }
-
-    return SimulationResponse(
-        name=result.name,
-        years=result.years,
-        baseline=KeyIndicatorsResponse(
-            years=result.baseline_indicators.years,
-            gdp_growth=result.baseline_indicators.gdp_growth,
-            inflation=result.baseline_indicators.inflation,
-            deficit_ratio=result.baseline_indicators.deficit_ratio,
-            unemployment=result.baseline_indicators.unemployment,
-        ),
-        scenario=KeyIndicatorsResponse(
-            years=result.scenario_indicators.years,
-            gdp_growth=result.scenario_indicators.gdp_growth,
-            inflation=result.scenario_indicators.inflation,
-            deficit_ratio=result.scenario_indicators.deficit_ratio,
-            unemployment=result.scenario_indicators.unemployment,
-        ),
-        impacts=impacts_str,
-        levels=levels_str,
-        convergence=[
-            ConvergenceInfo(**c) for c in result.convergence
-        ],
-        instruments=result.instruments,
+    # Encode the engine output directly; KeyIndicators already has the
+    # KeyIndicatorsResponse fields, so no Pydantic round-trip is needed.
+    return ORJSONResponse(
+        content={
+            "name": result.name,
+            "years": result.years,
+            "baseline": result.baseline_indicators,
+            "scenario": result.scenario_indicators,
+            "impacts": result.impacts.to_dict(),
+            "levels": result.levels.to_dict(),
+            "convergence": result.convergence,
+            "instruments": result.instruments,
+        }
     )
 
 
 @router.get("/baseline", response_model=BaselineResponse)
 def get_baseline(
     engine: SimulationEngine = Depends(get_engine),
-) -> BaselineResponse:
+) -> Response:
     """Get baseline indicators and instrument specifications."""
     indicators = engine.get_baseline_indicators()
     instruments = engine.get_instrument_specs()
 
-    return BaselineResponse(
+    response = BaselineResponse(
         indicators=KeyIndicatorsResponse(
             years=indicators.years,
             gdp_growth=indicators.gdp_growth,
@@ -83,3 +69,4 @@ def get_baseline(
         ),
         instruments=instruments,
     )
+    return Response(response.model_dump_json(), media_type="application/json")
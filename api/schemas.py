@@ -2,7 +2,10 @@
 
 from __future__ import annotations
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
+
+# Response models are built once per request and never mutated.
+_RESPONSE_CONFIG = ConfigDict(extra="ignore", frozen=True)
 
 
 class SimulationRequest(BaseModel):
@@ -11,6 +14,8 @@ class SimulationRequest(BaseModel):
 
 
 class KeyIndicatorsResponse(BaseModel):
+    model_config = _RESPONSE_CONFIG
+
     years: list[int]
     gdp_growth: list[float]
     inflation: list[float]
@@ -19,6 +24,8 @@ class KeyIndicatorsResponse(BaseModel):
 
 
 class ConvergenceInfo(BaseModel):
+    model_config = _RESPONSE_CONFIG
+
     year: int
     iterations: int
     max_residual: float
@@ -26,17 +33,22 @@ class ConvergenceInfo(BaseModel):
 
 
 class SimulationResponse(BaseModel):
+    model_config = _RESPONSE_CONFIG
+
     name: str
     years: list[int]
     baseline: KeyIndicatorsResponse
     scenario: KeyIndicatorsResponse
-    impacts: dict[str, dict[str, float]]
-    levels: dict[str, dict[str, float]]
+    # Int year keys; Pydantic emits them as JSON object keys ("2013")
+    impacts: dict[str, dict[int, float]]
+    levels: dict[str, dict[int, float]]
     convergence: list[ConvergenceInfo]
     instruments: dict[str, float]
 
 
 class InstrumentSpecResponse(BaseModel):
+    model_config = _RESPONSE_CONFIG
+
     key: str
     label: str
     unit: str
@@ -47,9 +59,13 @@ class InstrumentSpecResponse(BaseModel):
 
 
 class BaselineResponse(BaseModel):
+    model_config = _RESPONSE_CONFIG
+
     indicators: KeyIndicatorsResponse
     instruments: list[InstrumentSpecResponse]
 
 
 class ErrorResponse(BaseModel):
+    model_config = _RESPONSE_CONFIG
+
     detail: str
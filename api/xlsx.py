@@ -0,0 +1,159 @@
+"""Minimal XLSX writer for the fixed-shape export sheets.
+
+Writes the OOXML parts by hand: a bold header row followed by rows of numbers
+or strings, one worksheet per entry. This skips the general-purpose Excel
+library entirely, which is all the export endpoint needs.
+"""
+
+import io
+import math
+import zipfile
+from collections.abc import Iterable, Sequence
+from xml.sax.saxutils import escape
+
+Sheet = tuple[str, Sequence[str], Iterable[Sequence]]
+
+_CONTENT_TYPES_HEAD = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" '
+    'ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/styles.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+)
+_CONTENT_TYPES_SHEET = (
+    '<Override PartName="/xl/worksheets/sheet{n}.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+)
+
+_ROOT_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="xl/workbook.xml"/>'
+    '</Relationships>'
+)
+
+_WORKBOOK_HEAD = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+    '<sheets>'
+)
+_WORKBOOK_SHEET = '<sheet name="{name}" sheetId="{n}" r:id="rId{n}"/>'
+
+_WORKBOOK_RELS_HEAD = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+)
+_WORKBOOK_RELS_SHEET = (
+    '<Relationship Id="rId{n}" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+    'Target="worksheets/sheet{n}.xml"/>'
+)
+_WORKBOOK_RELS_STYLES = (
+    '<Relationship Id="rId{n}" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" '
+    'Target="styles.xml"/>'
+)
+
+# Style 0 is the default cell format, style 1 is bold (header row).
+_STYLES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<styleSheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+    '<fonts count="2">'
+    '<font><sz val="11"/><name val="Calibri"/></font>'
+    '<font><b/><sz val="11"/><name val="Calibri"/></font>'
+    '</fonts>'
+    '<fills count="2"><fill><patternFill patternType="none"/></fill>'
+    '<fill><patternFill patternType="gray125"/></fill></fills>'
+    '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+    '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+    '<cellXfs count="2">'
+    '<xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+    '<xf numFmtId="0" fontId="1" fillId="0" borderId="0" xfId="0" applyFont="1"/>'
+    '</cellXfs>'
+    '</styleSheet>'
+)
+
+_SHEET_HEAD = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+    '<sheetData>'
+)
+_SHEET_TAIL = '</sheetData></worksheet>'
+
+
+def _column_letters(n: int) -> list[str]:
+    """Excel column names A, B, ..., Z, AA, ... for the first n columns."""
+    letters = []
+    for i in range(1, n + 1):
+        name = ""
+        while i:
+            i, rem = divmod(i - 1, 26)
+            name = chr(65 + rem) + name
+        letters.append(name)
+    return letters
+
+
+def _cell(ref: str, value, style: str) -> str:
+    if isinstance(value, str):
+        return f'<c r="{ref}"{style} t="inlineStr"><is><t>{escape(value)}</t></is></c>'
+    if isinstance(value, float) and not math.isfinite(value):
+        return f'<c r="{ref}"{style} t="e"><v>#NUM!</v></c>'
+    return f'<c r="{ref}"{style}><v>{value!r}</v></c>'
+
+
+def _sheet_xml(header: Sequence[str], rows: Iterable[Sequence]) -> str:
+    rows = list(rows)
+    width = max([len(header), *(len(row) for row in rows)])
+    cols = _column_letters(width)
+    parts = [_SHEET_HEAD]
+    for r, (row, style) in enumerate(
+        [(header, ' s="1"'), *((row, "") for row in rows)], start=1
+    ):
+        cells = "".join(
+            _cell(f"{col}{r}", value, style) for col, value in zip(cols, row)
+        )
+        parts.append(f'<row r="{r}">{cells}</row>')
+    parts.append(_SHEET_TAIL)
+    return "".join(parts)
+
+
+def build_workbook(sheets: Sequence[Sheet]) -> bytes:
+    """Assemble an .xlsx file from (title, header, rows) sheets."""
+    n = len(sheets)
+    content_types = (
+        _CONTENT_TYPES_HEAD
+        + "".join(_CONTENT_TYPES_SHEET.format(n=i) for i in range(1, n + 1))
+        + "</Types>"
+    )
+    workbook = (
+        _WORKBOOK_HEAD
+        + "".join(
+            _WORKBOOK_SHEET.format(name=escape(title, {'"': "&quot;"}), n=i)
+            for i, (title, _, _) in enumerate(sheets, start=1)
+        )
+        + "</sheets></workbook>"
+    )
+    workbook_rels = (
+        _WORKBOOK_RELS_HEAD
+        + "".join(_WORKBOOK_RELS_SHEET.format(n=i) for i in range(1, n + 1))
+        + _WORKBOOK_RELS_STYLES.format(n=n + 1)
+        + "</Relationships>"
+    )
+
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("[Content_Types].xml", content_types)
+        zf.writestr("_rels/.rels", _ROOT_RELS)
+        zf.writestr("xl/workbook.xml", workbook)
+        zf.writestr("xl/_rels/workbook.xml.rels", workbook_rels)
+        zf.writestr("xl/styles.xml", _STYLES)
+        for i, (_, header, rows) in enumerate(sheets, start=1):
+            zf.writestr(f"xl/worksheets/sheet{i}.xml", _sheet_xml(header, rows))
+    return buf.getvalue()
@@ -0,0 +1,369 @@
+"""Fuse equation expressions into one generated function.
+
+Equations that are plain formulas declare them as ``Equation.expression``, a
+Python expression over variable names, e.g. ``"X_ * PX_"``. ``NAME[-k]`` reads
+the value k years back (for k > 1, the first year if that is before the start of
+the data), ``scalars.<field>`` a model parameter, and ``safe_exp``, ``log_diff``,
+``log``, ``exp``, ``min``, ``max`` and the kernels of ml2.equations._kernels are
+available as functions::
+
+    "Y_ / LH_ if LH_ != 0 else PROD_[-1]"
+
+compile_block() lowers a sequence of such equations to one function
+``block(data, start, stop)`` that evaluates them in order for every year column
+in ``range(start, stop)``, reading and writing the state's backing array by
+row number. Scalars are inlined as constants, so growth factors such as
+``(1 + scalars.tfp_growth)`` fold to a single constant at compile time. With Numba installed the function
+is JIT-compiled, so a whole phase runs without any per-equation dispatch.
+
+bind_expression() specializes a single equation the same way, as a plain Python
+``fn(data, j)`` returning the value for year column j, for the year-by-year
+phases. Expressions are written for the case where every optional input exists;
+if one is missing from the layout the equation keeps using compute().
+
+compile_inter() lowers the whole INTER phase to one function that runs the
+under-relaxed Gauss-Seidel sweeps for a year column until they converge, so with
+Numba the iteration never returns to the interpreter. compile_batch() wraps the
+PRE block and that iteration in one function over a stack of scenarios, run in
+parallel (prange) across them.
+
+With Numba, the generated source is written as a module in the user cache
+directory (``ML2_CACHE_DIR`` if set) and compiled with ``cache=True``, so later
+processes load the machine code instead of compiling it again. The module name
+hashes the source together with the kernels it inlines, so editing a kernel
+invalidates the compiled functions that call it. Only the most recently used
+_MODULE_LIMIT modules are kept, with their Numba caches.
+"""
+
+from __future__ import annotations
+
+import ast
+import contextlib
+import hashlib
+import importlib.util
+import math
+import os
+import sys
+from collections.abc import Callable, Mapping, Sequence
+from pathlib import Path
+from typing import NamedTuple
+
+import numpy as np
+
+from ml2.equations import _kernels, base
+from ml2.equations._kernels import JIT_AVAILABLE, njit, prange
+from ml2.equations.base import Equation
+from ml2.parameters import ML2Scalars
+from ml2.types import VarName
+
+Block = Callable[[np.ndarray, int, int], None]
+# inter(data, j, rows, eps, max_iter) -> (iterations, max_residual, converged)
+InterBlock = Callable[[np.ndarray, int, np.ndarray, float, int], tuple[int, float, bool]]
+# batch(data, j, rows, eps, max_iter, iterations, residuals, converged) over
+# data[scenario, row, column]; the inter() results go to the three output arrays
+BatchBlock = Callable[
+    [np.ndarray, int, np.ndarray, float, int, np.ndarray, np.ndarray, np.ndarray], None
+]
+
+_KERNELS = {
+    kernel.__name__: kernel
+    for kernel in (
+        _kernels.consumption_kernel, _kernels.business_investment_kernel,
+        _kernels.housing_investment_kernel, _kernels.export_volume_kernel,
+        _kernels.import_volume_kernel, _kernels.labour_hours_kernel, _kernels.wage_kernel,
+        _kernels.consumer_price_kernel, _kernels.cost_deflator_kernel,
+        _kernels.public_investment_deflator_kernel, _kernels.export_price_kernel,
+        _kernels.output_kernel, _kernels.potential_output_kernel,
+        _kernels.disposable_income_kernel,
+        _kernels.government_receipts_kernel,
+    )
+}
+_FUNCTIONS = {
+    "safe_exp": _kernels.safe_exp, "log_diff": _kernels.log_diff, "log": math.log, "exp": math.exp,
+    "min": min, "max": max, **_KERNELS,
+}
+# Interpreted counterparts, for the plain Python functions of bind_expression()
+_PY_FUNCTIONS = {
+    "safe_exp": base.safe_exp, "log_diff": base.log_diff, "log": math.log, "exp": math.exp,
+    "min": min, "max": max, **_KERNELS,
+}
+
+# Generated source -> compiled block, so equal layouts share one compilation
+_CACHE: dict[str, Block] = {}
+_FN_CACHE: dict[str, Callable[[np.ndarray, int], float]] = {}
+_INTER_CACHE: dict[str, InterBlock] = {}
+_BATCH_CACHE: dict[str, BatchBlock] = {}
+
+
+def _cache_dir() -> Path:
+    """Where generated modules go: ML2_CACHE_DIR, else ml2/codegen in the user cache."""
+    if path := os.environ.get("ML2_CACHE_DIR"):
+        return Path(path)
+    root = os.environ.get("LOCALAPPDATA" if sys.platform == "win32" else "XDG_CACHE_HOME")
+    return Path(root or Path.home() / ".cache") / "ml2" / "codegen"
+
+
+# Generated modules, kept on disk so Numba can cache them across runs
+_MODULE_DIR = _cache_dir()
+# Each layout, scalars and relaxation generates its own modules; keep the newest
+_MODULE_LIMIT = 256
+_MODULE_HEAD = (
+    "import numpy as np\n"
+    "from ml2.codegen import _FUNCTIONS\n"
+    "from ml2.equations._kernels import njit, prange\n"
+    "globals().update(_FUNCTIONS)\n\n\n"
+)
+_KERNELS_DIGEST = hashlib.sha256(Path(_kernels.__file__).read_bytes()).hexdigest()
+
+
+class BoundExpression(NamedTuple):
+    """An equation's expression specialized to one state layout."""
+
+    name: VarName
+    row: int
+    fn: Callable[[np.ndarray, int], float]  # fn(data, j) -> value at year column j
+
+
+class _Lower(ast.NodeTransformer):
+    """Rewrite variable names to data[row, j - lag] and inline scalars."""
+
+    def __init__(
+        self, rows: Mapping[VarName, int], scalars: ML2Scalars, item: bool = False
+    ) -> None:
+        self._rows = rows
+        self._scalars = scalars
+        # item(row, j) (a Python float, for interpreted code) instead of data[row, j]
+        self._item = item
+
+    def _cell(self, var: str, lag: int) -> ast.expr:
+        if var not in self._rows:
+            raise KeyError(var)
+        col: ast.expr = ast.Name("j", ast.Load())
+        if lag:
+            col = ast.BinOp(col, ast.Sub(), ast.Constant(lag))
+        if lag > 1:
+            # The year loop starts at the second column; deeper lags stop at the first
+            col = ast.Call(ast.Name("max", ast.Load()), [col, ast.Constant(0)], [])
+        row = ast.Constant(self._rows[var])
+        if self._item:
+            return ast.Call(ast.Name("item", ast.Load()), [row, col], [])
+        return ast.Subscript(
+            ast.Name("data", ast.Load()), ast.Tuple([row, col], ast.Load()), ast.Load()
+        )
+
+    def visit_Name(self, node: ast.Name) -> ast.expr:
+        if node.id in _FUNCTIONS:
+            return node
+        return self._cell(node.id, 0)
+
+    def visit_Subscript(self, node: ast.Subscript) -> ast.expr:
+        # NAME[-k]: value k years back
+        index = node.slice
+        if (
+            isinstance(node.value, ast.Name)
+            and isinstance(index, ast.UnaryOp)
+            and isinstance(index.op, ast.USub)
+            and isinstance(index.operand, ast.Constant)
+        ):
+            return self._cell(node.value.id, index.operand.value)
+        raise ValueError(f"unsupported subscript: {ast.unparse(node)}")
+
+    def visit_Attribute(self, node: ast.Attribute) -> ast.expr:
+        if isinstance(node.value, ast.Name) and node.value.id == "scalars":
+            return ast.Constant(float(getattr(self._scalars, node.attr)))
+        raise ValueError(f"unsupported attribute: {ast.unparse(node)}")
+
+
+def _lowered(equation: Equation, lower: _Lower) -> str:
+    if equation.expression is None:
+        raise ValueError(f"{equation.name} has no expression")
+    return ast.unparse(lower.visit(ast.parse(equation.expression, mode="eval").body))
+
+
+def block_source(
+    equations: Sequence[Equation], rows: Mapping[VarName, int], scalars: ML2Scalars
+) -> str:
+    """Source of the fused block function (raises KeyError on unknown variables)."""
+    lower = _Lower(rows, scalars)
+    lines = ["def block(data, start, stop):", "    for j in range(start, stop):"]
+    for eq in equations:
+        lines.append(f"        data[{rows[eq.name]}, j] = {_lowered(eq, lower)}  # {eq.name}")
+    return "\n".join(lines) + "\n"
+
+
+def inter_source(
+    equations: Sequence[Equation], rows: Mapping[VarName, int], scalars: ML2Scalars,
+    relaxation: float,
+) -> str:
+    """Source of the INTER iteration function (raises KeyError on unknown variables).
+
+    Each sweep sets every target to relaxation * computed + (1 - relaxation) * old,
+    in order; the residual over ``rows`` is the solver's max relative change.
+    """
+    lower = _Lower(rows, scalars)
+    relax, keep = relaxation, 1 - relaxation
+    sweep = [
+        f"        data[{rows[eq.name]}, j] = "
+        f"{relax!r} * ({_lowered(eq, lower)}) + {keep!r} * data[{rows[eq.name]}, j]"
+        f"  # {eq.name}"
+        for eq in equations
+    ]
+    return "\n".join([
+        "def inter(data, j, rows, eps, max_iter):",
+        "    old = np.empty(len(rows), data.dtype)",
+        "    for i in range(len(rows)):",
+        "        old[i] = data[rows[i], j]",
+        "    max_resid = 0.0",
+        "    for it in range(1, max_iter + 1):",
+        *sweep,
+        "        max_resid = 0.0",
+        "        for i in range(len(rows)):",
+        "            new = data[rows[i], j]",
+        "            resid = abs(new - old[i])",
+        "            if abs(old[i]) > 1e-10:",
+        "                resid = resid / abs(old[i])",
+        "            if resid > max_resid or resid != resid:  # NaN sticks, as in ndarray.max()",
+        "                max_resid = resid",
+        "            old[i] = new",
+        "        if max_resid < eps:",
+        "            return it, max_resid, True",
+        "    return max_iter, max_resid, False",
+    ]) + "\n"
+
+
+def _jit(source: str, name: str, parallel: bool = False) -> Callable:
+    """The function ``name`` defined by source, JIT-compiled with Numba if available.
+
+    With Numba the source is loaded from a generated module file so its compiled
+    code is cached on disk; if that file cannot be written it is compiled in memory.
+    """
+    if JIT_AVAILABLE:
+        key = hashlib.sha256((_KERNELS_DIGEST + source).encode()).hexdigest()[:20]
+        path = _MODULE_DIR / f"{name}_{key}.py"
+        try:
+            if path.exists():
+                os.utime(path)  # most recently used, for _prune
+            else:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                tmp = path.with_suffix(f".{os.getpid()}.tmp")
+                tmp.write_text(_MODULE_HEAD + source)
+                tmp.replace(path)  # atomic, for concurrent workers
+                _prune(_MODULE_DIR, _MODULE_LIMIT)
+            module_name = f"ml2._codegen_{key}"
+            spec = importlib.util.spec_from_file_location(module_name, path)
+            module = importlib.util.module_from_spec(spec)
+            # Numba's cache finds the function's globals again by module name
+            sys.modules[module_name] = module
+            spec.loader.exec_module(module)
+            return njit(cache=True, parallel=parallel)(getattr(module, name))
+        except OSError:  # read-only install
+            pass
+    namespace: dict = {**_FUNCTIONS, "np": np, "njit": njit, "prange": prange}
+    # source is generated from the registry's expressions, never from user input
+    exec(compile(source, "<ml2.codegen>", "exec"), namespace)  # noqa: S102
+    return njit(parallel=parallel)(namespace[name])
+
+
+def _prune(directory: Path, keep: int) -> None:
+    """Delete all but the keep most recently used modules in directory, and the
+    Numba cache files (``__pycache__/<module>.*``) of modules no longer there."""
+    modules = sorted(directory.glob("*.py"), key=_mtime, reverse=True)
+    kept = {path.stem for path in modules[:keep]}
+    stale = [*modules[keep:], *(
+        path for path in directory.glob("__pycache__/*")
+        if path.name.partition(".")[0] not in kept
+    )]
+    for path in stale:
+        with contextlib.suppress(OSError):  # gone already, or in use (Windows)
+            path.unlink()
+
+
+def _mtime(path: Path) -> float:
+    try:
+        return path.stat().st_mtime
+    except OSError:  # deleted by a concurrent prune
+        return 0.0
+
+
+def batch_source(
+    pre: Sequence[Equation], inter: Sequence[Equation], rows: Mapping[VarName, int],
+    scalars: ML2Scalars, relaxation: float,
+) -> str:
+    """Source of the batch function (raises KeyError on unknown variables).
+
+    For each scenario b it runs the PRE block for year column j, then the INTER
+    iteration of inter_source(), on data[b]; scenarios are independent, so they are
+    spread over threads.
+    """
+    lines = ["@njit", inter_source(inter, rows, scalars, relaxation)]
+    if pre:
+        lines += ["@njit", block_source(pre, rows, scalars)]
+    lines += [
+        "def batch(data, j, rows, eps, max_iter, iterations, residuals, converged):",
+        "    for b in prange(data.shape[0]):",
+        *(["        block(data[b], j, j + 1)"] if pre else []),
+        "        iterations[b], residuals[b], converged[b] = inter(",
+        "            data[b], j, rows, eps, max_iter",
+        "        )",
+    ]
+    return "\n".join(lines) + "\n"
+
+
+def compile_block(
+    equations: Sequence[Equation], rows: Mapping[VarName, int], scalars: ML2Scalars
+) -> Block:
+    """Compile equations (in evaluation order) to block(data, start, stop)."""
+    source = block_source(equations, rows, scalars)
+    block = _CACHE.get(source)
+    if block is None:
+        block = _CACHE[source] = _jit(source, "block")
+    return block
+
+
+def compile_inter(
+    equations: Sequence[Equation], rows: Mapping[VarName, int], scalars: ML2Scalars,
+    relaxation: float,
+) -> InterBlock:
+    """Compile the INTER equations (in solve order) to inter(data, j, rows, eps, max_iter)."""
+    source = inter_source(equations, rows, scalars, relaxation)
+    inter = _INTER_CACHE.get(source)
+    if inter is None:
+        inter = _INTER_CACHE[source] = _jit(source, "inter")
+    return inter
+
+
+def compile_batch(
+    pre: Sequence[Equation], inter: Sequence[Equation], rows: Mapping[VarName, int],
+    scalars: ML2Scalars, relaxation: float,
+) -> BatchBlock:
+    """Compile phases 1 and 2 over a stack of scenarios to batch(data, j, rows, ...)."""
+    source = batch_source(pre, inter, rows, scalars, relaxation)
+    batch = _BATCH_CACHE.get(source)
+    if batch is None:
+        batch = _BATCH_CACHE[source] = _jit(source, "batch", parallel=True)
+    return batch
+
+
+def bind_expression(
+    equation: Equation, rows: Mapping[VarName, int], scalars: ML2Scalars
+) -> BoundExpression | None:
+    """equation's expression as fn(data, j); None if it has none or reads a missing variable."""
+    if equation.expression is None or equation.name not in rows:
+        return None
+    lower = _Lower(rows, scalars, item=True)
+    try:
+        expr = _lowered(equation, lower)
+    except KeyError:
+        return None
+    source = (
+        "def compute(data, j):\n"
+        "    item = data.item\n"
+        f"    return {expr}  # {equation.name}\n"
+    )
+    fn = _FN_CACHE.get(source)
+    if fn is None:
+        namespace: dict = dict(_PY_FUNCTIONS)
+        # As in _jit: source comes from the registry's expressions, not user input
+        exec(compile(source, "<ml2.codegen>", "exec"), namespace)  # noqa: S102
+        fn = _FN_CACHE[source] = namespace["compute"]
+    return BoundExpression(equation.name, rows[equation.name], fn)
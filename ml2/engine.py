@@ -4,7 +4,10 @@ from __future__ import annotations
 
 from dataclasses import dataclass, field
 
-from ml2.equations.registry import EquationRegistry
+import numpy as np
+from numpy.typing import DTypeLike
+
+from ml2.equations.registry import get_registry
 from ml2.impact import compute_impacts
 from ml2.instruments import (
     INSTRUMENTS,
@@ -15,7 +18,7 @@ from ml2.instruments import (
 from ml2.parameters import ML2Scalars
 from ml2.solver import GaussSeidelSolver, YearConvergence
 from ml2.state import SimulationState
-from ml2.types import VarName, Year
+from ml2.types import SeriesMatrix, Year
 from ml2.variables import KEY_INDICATORS, BaselineDataLoader
 
 
@@ -38,8 +41,8 @@ class SimulationOutput:
     years: list[Year]
     baseline_indicators: KeyIndicators
     scenario_indicators: KeyIndicators
-    impacts: dict[VarName, dict[Year, float]]
-    levels: dict[VarName, dict[Year, float]]
+    impacts: SeriesMatrix         # sim years only
+    levels: SeriesMatrix          # all years, key variables
     convergence: list[dict]
     instruments: dict[str, float]
 
@@ -47,17 +50,36 @@ class SimulationOutput:
 class SimulationEngine:
     """Main orchestrator: loads baseline, applies instruments, solves, computes impacts."""
 
-    def __init__(self) -> None:
+    def __init__(self, dtype: DTypeLike = np.float64) -> None:
         self._loader = BaselineDataLoader()
+        self._dtype = dtype  # of the state arrays; see SimulationState
         self._scalars = ML2Scalars()
-        self._registry = EquationRegistry()
+        self._registry = get_registry()
         self._solver = GaussSeidelSolver(self._registry, self._scalars)
         self._baseline: SimulationState | None = None
+        self._baseline_indicators: KeyIndicators | None = None
+        self._instrument_specs = [
+            {
+                "key": i.key,
+                "label": i.label,
+                "unit": i.unit,
+                "default": i.default,
+                "min": i.min_val,
+                "max": i.max_val,
+                "description": i.description,
+            }
+            for i in INSTRUMENTS
+        ]
 
     def load_baseline(self) -> None:
         """Load baseline data from disk and ensure all model variables exist."""
-        self._baseline = self._loader.load_state()
+        self._baseline = self._loader.load_state(self._dtype)
         self._ensure_variables(self._baseline)
+        self._solver.compile(self._baseline)
+        # The baseline never changes after loading, so neither do its indicators
+        self._baseline_indicators = self._extract_indicators(
+            self._baseline, self._baseline.sim_years
+        )
 
     def _ensure_variables(self, state: SimulationState) -> None:
         """Add any missing variables that the solver needs, with sensible defaults."""
@@ -114,10 +136,17 @@ class SimulationEngine:
             return s.cost_w * ulc + s.cost_pm * pm
         ensure("COST_", cost_fn)
 
-        # Ensure all remaining registry variables exist
-        for var in self._registry.all_variables:
-            if not state.has_var(var):
-                state.add_var(var, 0.0)
+        # All remaining registry variables and the instrument columns, so equations
+        # can read them unconditionally and scenario copies never need to grow
+        state.preallocate(
+            [*self._registry.all_variables, *(spec.key for spec in INSTRUMENTS)],
+            {
+                "CSSFR_": s.css_emp_rate,
+                "CSSHR_": s.css_house_rate,
+                "ITPC0R_": s.vat_rate * 100,
+                **{spec.key: spec.default for spec in INSTRUMENTS},
+            },
+        )
 
     @property
     def baseline(self) -> SimulationState:
@@ -129,10 +158,10 @@ class SimulationEngine:
         """Extract key indicators from a simulation state."""
         return KeyIndicators(
             years=sim_years,
-            gdp_growth=[state.grt("GDP_", t) for t in sim_years],
-            inflation=[state.grt("PC_", t) for t in sim_years],
-            deficit_ratio=[state.get("DR_", t) * 100 for t in sim_years],
-            unemployment=[state.get("UR_", t) * 100 for t in sim_years],
+            gdp_growth=state.grt_series("GDP_", sim_years).tolist(),
+            inflation=state.grt_series("PC_", sim_years).tolist(),
+            deficit_ratio=(state.series("DR_", sim_years) * 100).tolist(),
+            unemployment=(state.series("UR_", sim_years) * 100).tolist(),
         )
 
     def simulate(
@@ -157,8 +186,8 @@ class SimulationEngine:
                 raise ValueError(f"Invalid instruments: {'; '.join(errors)}")
             instruments.update(instrument_values)
 
-        # Copy baseline state for scenario
-        baseline_state = self.baseline.copy()
+        # The baseline is only read; the scenario gets its own copy
+        baseline_state = self.baseline.readonly()
         scenario_state = self.baseline.copy()
         sim_years = scenario_state.sim_years
 
@@ -169,7 +198,7 @@ class SimulationEngine:
         convergence = self._solver.solve(scenario_state, sim_years)
 
         # Extract indicators
-        baseline_ind = self._extract_indicators(baseline_state, sim_years)
+        baseline_ind = self.get_baseline_indicators()
         scenario_ind = self._extract_indicators(scenario_state, sim_years)
 
         # Compute impacts for all tracked variables
@@ -183,7 +212,7 @@ class SimulationEngine:
             "YDH_", "GDPN_", "K_", "PROD_", "ULC_",
             "GRECEIPTS_", "GEXPENSE_", "D_", "B_",
         ]
-        levels = scenario_state.to_dict(level_vars)
+        levels = scenario_state.matrix(level_vars)
 
         return SimulationOutput(
             name=name,
@@ -205,22 +234,11 @@ class SimulationEngine:
         )
 
     def get_baseline_indicators(self) -> KeyIndicators:
-        """Return baseline key indicators without running a simulation."""
-        state = self.baseline
-        sim_years = state.sim_years
-        return self._extract_indicators(state, sim_years)
+        """Return baseline key indicators without running a simulation (cached)."""
+        if self._baseline_indicators is None:
+            self.load_baseline()
+        return self._baseline_indicators  # type: ignore[return-value]
 
     def get_instrument_specs(self) -> list[dict]:
-        """Return instrument specifications."""
-        return [
-            {
-                "key": i.key,
-                "label": i.label,
-                "unit": i.unit,
-                "default": i.default,
-                "min": i.min_val,
-                "max": i.max_val,
-                "description": i.description,
-            }
-            for i in INSTRUMENTS
-        ]
+        """Return instrument specifications (built once per engine)."""
+        return self._instrument_specs
@@ -0,0 +1,377 @@
+"""Numeric kernels for the behavioral, wage and price equations.
+
+Each kernel takes plain floats (current values, lags, parameters) and returns the
+new value of its target variable. Kernels are compiled with Numba when it is
+installed (``pip install -e ".[jit]"``); otherwise ``njit`` is a no-op and they
+run as ordinary Python functions.
+
+The Cobb-Douglas outputs (Y_, YSTAR_) and the multi-step identities (YDH_,
+GRECEIPTS_) have kernels too, so their
+expressions stay one call. Kernels are compiled without fastmath: ml2.codegen
+inlines them into generated functions with the parameters as constants, and
+strict IEEE arithmetic keeps those results identical to calling the kernel.
+"""
+
+import math
+
+try:
+    from numba import njit, prange
+
+    JIT_AVAILABLE = True
+except ImportError:  # numba is an optional dependency
+    JIT_AVAILABLE = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit (supports bare and parametrized use)."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda fn: fn
+
+
+@njit(inline="always")
+def safe_exp(x: float, limit: float = 0.5) -> float:
+    """Clamped exponential to prevent overflow during iterative solving.
+
+    NaN clamps to +limit, as in ml2.equations.base.safe_exp.
+    """
+    if not x < limit:
+        x = limit
+    elif x < -limit:
+        x = -limit
+    return math.exp(x)
+
+
+@njit(inline="always")
+def log_diff(cur: float, prev: float) -> float:
+    """ln(cur) - ln(prev), 0 if either is non-positive."""
+    if cur <= 0 or prev <= 0:
+        return 0.0
+    return math.log(cur / prev)
+
+
+@njit(cache=True)
+def consumption_kernel(
+    c_prev: float, c_2: float,
+    ydh: float, ydh_1: float, pc: float, pc_1: float,
+    rr: float, rr_1: float, d_ur: float,
+    c0: float, c1: float, c2: float, c3: float, c4: float, c5: float, c6: float,
+) -> float:
+    """C_: ECM with real income, real interest rate, unemployment and habit."""
+    if c_prev <= 0:
+        return c_prev
+
+    if ydh > 0 and pc > 0 and ydh_1 > 0 and pc_1 > 0:
+        dln_rydi = math.log((ydh * pc_1) / (pc * ydh_1))
+    else:
+        dln_rydi = 0.0
+
+    if ydh_1 > 0 and pc_1 > 0:
+        ecm = math.log(c_prev) - c5 * math.log(ydh_1 / pc_1)
+    else:
+        ecm = 0.0
+
+    if c_2 > 0:
+        dln_c_lag = math.log(c_prev / c_2)
+    else:
+        dln_c_lag = 0.0
+
+    dln_c = (
+        c0
+        + c1 * dln_rydi
+        + c2 * (rr - rr_1)
+        + c3 * d_ur
+        + c4 * ecm
+        + c6 * dln_c_lag
+    )
+    return c_prev * safe_exp(dln_c)
+
+
+@njit(cache=True)
+def business_investment_kernel(
+    if_prev: float, dln_y: float, y_1: float,
+    profit: float, profit_1: float, rr: float, rr_1: float, zkf: float, zkf_1: float,
+    if0: float, if1: float, if2: float, if3: float, if4: float, if5: float, if6: float,
+) -> float:
+    """IF_: accelerator + profitability + interest rate + capacity ECM."""
+    if if_prev <= 0:
+        return if_prev
+
+    if y_1 > 0:
+        ecm = math.log(if_prev) - if6 * math.log(y_1)
+    else:
+        ecm = 0.0
+
+    dln_if = (
+        if0
+        + if1 * dln_y
+        + if2 * (profit - profit_1)
+        + if3 * (rr - rr_1)
+        + if4 * (zkf - zkf_1)
+        + if5 * ecm
+    )
+    return if_prev * safe_exp(dln_if)
+
+
+@njit(cache=True)
+def housing_investment_kernel(
+    ih_prev: float,
+    ydh: float, ydh_1: float, pc: float, pc_1: float, rm: float, rm_1: float,
+    ih0: float, ih1: float, ih2: float, ih3: float, ih4: float,
+) -> float:
+    """IH_: real income + mortgage rate ECM."""
+    if ih_prev <= 0:
+        return ih_prev
+
+    if ydh > 0 and pc > 0 and ydh_1 > 0 and pc_1 > 0:
+        dln_rydi = math.log((ydh * pc_1) / (pc * ydh_1))
+    else:
+        dln_rydi = 0.0
+
+    if ydh_1 > 0 and pc_1 > 0:
+        ecm = math.log(ih_prev) - ih4 * math.log(ydh_1 / pc_1)
+    else:
+        ecm = 0.0
+
+    dln_ih = ih0 + ih1 * dln_rydi + ih2 * (rm - rm_1) + ih3 * ecm
+    return ih_prev * safe_exp(dln_ih)
+
+
+@njit(cache=True)
+def export_volume_kernel(
+    x_prev: float, dln_xw: float, xw_1: float,
+    px: float, px_1: float, pcomp: float, pcomp_1: float,
+    x0: float, x1: float, x2: float, x3: float, x4: float, x5: float,
+) -> float:
+    """X_: foreign demand + price competitiveness ECM."""
+    if x_prev <= 0:
+        return x_prev
+
+    if px > 0 and pcomp > 0 and px_1 > 0 and pcomp_1 > 0:
+        dln_relpx = math.log((px * pcomp_1) / (pcomp * px_1))
+    else:
+        dln_relpx = 0.0
+
+    if xw_1 > 0 and px_1 > 0 and pcomp_1 > 0:
+        ecm = math.log(x_prev) - x4 * math.log(xw_1) - x5 * math.log(px_1 / pcomp_1)
+    else:
+        ecm = 0.0
+
+    dln_x = x0 + x1 * dln_xw + x2 * dln_relpx + x3 * ecm
+    return x_prev * safe_exp(dln_x)
+
+
+@njit(cache=True)
+def import_volume_kernel(
+    m_prev: float, dln_dd: float, dd_1: float,
+    pm: float, pm_1: float, pc: float, pc_1: float,
+    m0: float, m1: float, m2: float, m3: float, m4: float, m5: float,
+) -> float:
+    """M_: domestic demand + relative import price ECM."""
+    if m_prev <= 0:
+        return m_prev
+
+    if pm > 0 and pc > 0 and pm_1 > 0 and pc_1 > 0:
+        dln_relpm = math.log((pm * pc_1) / (pc * pm_1))
+    else:
+        dln_relpm = 0.0
+
+    if dd_1 > 0 and pm_1 > 0 and pc_1 > 0:
+        ecm = math.log(m_prev) - m4 * math.log(dd_1) - m5 * math.log(pm_1 / pc_1)
+    else:
+        ecm = 0.0
+
+    dln_m = m0 + m1 * dln_dd + m2 * dln_relpm + m3 * ecm
+    return m_prev * safe_exp(dln_m)
+
+
+@njit(cache=True)
+def labour_hours_kernel(
+    lh_prev: float, y: float, y_1: float, k_1: float, tfp_1: float,
+    alpha: float, lh0: float, lh1: float, lh2: float,
+) -> float:
+    """LH_: output growth + production-function ECM."""
+    if lh_prev <= 0:
+        return lh_prev
+
+    dln_y = log_diff(y, y_1)
+
+    if y_1 > 0 and k_1 > 0 and tfp_1 > 0 and lh_prev > 0:
+        ecm = (
+            math.log(y_1 / tfp_1)
+            - (1 - alpha) * math.log(k_1)
+            - alpha * math.log(lh_prev)
+        )
+    else:
+        ecm = 0.0
+
+    dln_lh = lh0 + lh1 * dln_y + lh2 * ecm
+    return lh_prev * safe_exp(dln_lh)
+
+
+@njit(cache=True)
+def wage_kernel(
+    w_prev: float, pc: float, pc_1: float,
+    y: float, lh: float, y_1: float, lh_1: float, ur: float, l_1: float,
+    wr_x: float, zx_x: float, nairu: float,
+    w0: float, w1: float, w2: float, w3: float, w4: float, w5: float,
+) -> float:
+    """W_: Phillips curve + indexation + productivity + wage-share ECM."""
+    if w_prev <= 0:
+        return w_prev
+
+    dln_pc = log_diff(pc, pc_1)
+
+    if y > 0 and lh > 0 and y_1 > 0 and lh_1 > 0:
+        dln_prod = math.log((y * lh_1) / (lh * y_1))
+    else:
+        dln_prod = 0.0
+
+    if y_1 > 0 and pc_1 > 0:
+        ws_1 = (w_prev * l_1) / (pc_1 * y_1 * 1000)
+    else:
+        ws_1 = w5
+
+    dln_w = (
+        w0
+        + w1 * dln_pc
+        + w2 * dln_prod
+        + w3 * (ur - nairu)
+        + w4 * (ws_1 - w5)
+    )
+    dln_w += wr_x / 100.0
+    dln_w += zx_x / 100.0
+    return w_prev * safe_exp(dln_w)
+
+
+@njit(cache=True)
+def consumer_price_kernel(
+    pc_prev: float, cost: float, cost_1: float, dln_pm: float, ygap: float,
+    vat: float, vat_1: float,
+    pc0: float, pc1: float, pc2: float, pc3: float, pc4: float, pc5: float, pc_vat: float,
+) -> float:
+    """PC_: cost push + import prices + output gap + VAT + cost ECM."""
+    if pc_prev <= 0:
+        return pc_prev
+
+    dln_cost = log_diff(cost, cost_1)
+
+    if pc_prev > 0 and cost_1 > 0:
+        ecm = math.log(pc_prev) - pc5 * math.log(cost_1)
+    else:
+        ecm = 0.0
+
+    d_vat = (vat - vat_1) / 100.0
+
+    dln_pc = (
+        pc0
+        + pc1 * dln_cost
+        + pc2 * dln_pm
+        + pc3 * ygap
+        + pc4 * ecm
+        + pc_vat * d_vat
+    )
+    return pc_prev * safe_exp(dln_pc)
+
+
+@njit(cache=True)
+def cost_deflator_kernel(
+    p_prev: float, cost: float, cost_1: float, dln_pm: float,
+    a1: float, a2: float, a3: float,
+) -> float:
+    """PIF_/PIH_: cost push + import prices + [ln(P) - ln(COST)][-1] ECM."""
+    if p_prev <= 0:
+        return p_prev
+
+    dln_cost = log_diff(cost, cost_1)
+
+    if p_prev > 0 and cost_1 > 0:
+        ecm = math.log(p_prev / cost_1)
+    else:
+        ecm = 0.0
+
+    dln_p = a1 * dln_cost + a2 * dln_pm + a3 * ecm
+    return p_prev * safe_exp(dln_p)
+
+
+@njit(cache=True)
+def public_investment_deflator_kernel(
+    pig_prev: float, cost: float, cost_1: float, dln_pm: float,
+    pig1: float, pig2: float,
+) -> float:
+    """PIG_: follows the cost index and import prices."""
+    if pig_prev <= 0:
+        return pig_prev
+    dln_pig = pig1 * log_diff(cost, cost_1) + pig2 * dln_pm
+    return pig_prev * safe_exp(dln_pig)
+
+
+@njit(cache=True)
+def export_price_kernel(
+    px_prev: float, cost: float, cost_1: float, dln_pcomp: float, pcomp_1: float,
+    px1: float, px2: float, px3: float,
+) -> float:
+    """PX_: domestic cost vs competitor price ECM."""
+    if px_prev <= 0:
+        return px_prev
+
+    dln_cost = log_diff(cost, cost_1)
+
+    if px_prev > 0 and pcomp_1 > 0:
+        ecm = math.log(px_prev / pcomp_1)
+    else:
+        ecm = 0.0
+
+    dln_px = px1 * dln_cost + px2 * dln_pcomp + px3 * ecm
+    return px_prev * safe_exp(dln_px)
+
+
+@njit(inline="always")
+def cobb_douglas(tfp: float, k: float, lh: float, alpha: float) -> float:
+    """TFP * K^(1-alpha) * LH^alpha for K, LH > 0, as one exp of the log-linear form
+    (compiled, two logs and an exp are cheaper than two pow calls)."""
+    return tfp * math.exp((1 - alpha) * math.log(k) + alpha * math.log(lh))
+
+
+@njit(cache=True)
+def output_kernel(y_prev: float, tfp: float, k: float, lh: float, alpha: float) -> float:
+    """Y_: Cobb-Douglas in capital and hours; the previous value if an input is non-positive."""
+    if k <= 0 or lh <= 0 or tfp <= 0:
+        return y_prev
+    return cobb_douglas(tfp, k, lh, alpha)
+
+
+@njit(cache=True)
+def potential_output_kernel(
+    ystar_prev: float, tfp: float, k: float, nat: float, ng: float, lh: float, l: float,
+    alpha: float, nairu: float,
+) -> float:
+    """YSTAR_: Cobb-Douglas at structural employment and the current hours per worker."""
+    l_star = (1 - nairu) * nat - ng
+    lh_star = l_star * lh / max(l, 1.0)
+    if k <= 0 or lh_star <= 0:
+        return ystar_prev
+    return cobb_douglas(tfp, k, lh_star, alpha)
+
+
+@njit(cache=True)
+def disposable_income_kernel(
+    w: float, l: float, wg: float, ng: float, css_house: float, dth_x: float, tgh: float,
+) -> float:
+    """YDH_: wage bill net of employee SSC and income tax, plus transfers."""
+    total_wages = w * l / 1000.0 + wg * ng / 1000.0
+    net_wages = total_wages * (1 - css_house)
+    tax = net_wages * 0.25 + dth_x / 1000.0
+    return net_wages - tax + tgh
+
+
+@njit(cache=True)
+def government_receipts_kernel(
+    w: float, l: float, wg: float, ng: float, cssfr: float, csshr: float, dth_x: float,
+    vat_rate: float, c: float, pc: float, gdpn: float,
+) -> float:
+    """GRECEIPTS_: income tax + VAT + employer and employee SSC + other revenue."""
+    total_wb = w * l / 1000.0 + wg * ng / 1000.0
+    income_tax = total_wb * (1 - csshr) * 0.25 + dth_x / 1000.0
+    vat_revenue = c * pc * (vat_rate / 100.0) / (1 + vat_rate / 100.0)
+    return income_tax + vat_revenue + total_wb * cssfr + total_wb * csshr + gdpn * 0.12
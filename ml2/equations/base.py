@@ -3,15 +3,35 @@
 import math
 from abc import ABC, abstractmethod
 
+import numpy as np
+
 from ml2.parameters import ML2Scalars
 from ml2.state import SimulationState
 from ml2.types import EquationType, VarName, Year
 
+# Bound once: the interpreted equations call these in every sweep
+_exp = math.exp
+_log = math.log
+
 
 def safe_exp(x: float, limit: float = 0.5) -> float:
     """Clamped exponential to prevent overflow during iterative solving."""
-    x = max(-limit, min(limit, x))
-    return math.exp(x)
+    # Plain comparisons instead of max/min calls; NaN clamps to +limit as before.
+    if not x < limit:
+        x = limit
+    elif x < -limit:
+        x = -limit
+    return _exp(x)
+
+
+def log_diff(cur: float, prev: float) -> float:
+    """ln(cur) - ln(prev), 0 if either is non-positive (SimulationState.dln on values).
+
+    Lets an equation that also needs X[-1] itself read it once and reuse it.
+    """
+    if cur <= 0 or prev <= 0:
+        return 0.0
+    return _log(cur / prev)
 
 
 class Equation(ABC):
@@ -32,6 +52,29 @@ class Equation(ABC):
     def depends_on(self) -> list[VarName]:
         """Variables this equation reads (for dependency graph)."""
 
+    # Optional plain formula for the target, for ml2.codegen (None = compute() only).
+    # Must agree exactly with compute() when every optional input exists; see the
+    # codegen module for the syntax.
+    expression: str | None = None
+
+    # Scalars field g when the equation is the constant-growth trend X = X[-1] * (1 + g),
+    # so the registry can fill the whole path at once (see precompute_pre_phase).
+    trend: str | None = None
+
     @abstractmethod
     def compute(self, state: SimulationState, t: Year, scalars: ML2Scalars) -> float:
         """Compute the target variable value for year t."""
+
+    def compute_vec(self, state: SimulationState, cols: slice, scalars: ML2Scalars) -> np.ndarray:
+        """Compute the target for the year columns in cols (see SimulationState.year_slice).
+
+        The default calls compute() year by year and writes each result before the
+        next, so equations that read their own lag stay correct. Equations that only
+        combine same-year values override this with whole-slice NumPy arithmetic.
+        """
+        years = state.years[cols]
+        out = np.empty(len(years))
+        for i, t in enumerate(years):
+            out[i] = value = self.compute(state, t, scalars)
+            state.set(self.name, t, value)
+        return out
@@ -1,8 +1,13 @@
 """Behavioral ECM equations: C_, IF_, IH_, X_, M_ and supporting."""
 
-import math
-
-from ml2.equations.base import Equation, safe_exp as _safe_exp
+from ml2.equations._kernels import (
+    business_investment_kernel,
+    consumption_kernel,
+    export_volume_kernel,
+    housing_investment_kernel,
+    import_volume_kernel,
+)
+from ml2.equations.base import Equation, log_diff
 from ml2.parameters import ML2Scalars
 from ml2.state import SimulationState
 from ml2.types import EquationType, VarName, Year
@@ -18,54 +23,30 @@ class ConsumptionEquation(Equation):
     name = "C_"
     equation_type = EquationType.BEHAVIORAL
     depends_on = ["YDH_", "PC_", "UR_", "RREAL_"]
+    expression = (
+        "consumption_kernel(C_[-1], C_[-2], YDH_, YDH_[-1], PC_, PC_[-1],"
+        " RREAL_, RREAL_[-1], UR_ - UR_[-1], scalars.c0, scalars.c1, scalars.c2,"
+        " scalars.c3, scalars.c4, scalars.c5, scalars.c6)"
+    )
 
     def compute(self, state: SimulationState, t: Year, scalars: ML2Scalars) -> float:
-        c_prev = state.lag("C_", t)
-        if c_prev <= 0:
-            return c_prev
-
-        # Real disposable income
-        ydh = state.get("YDH_", t)
-        pc = state.get("PC_", t)
-        ydh_1 = state.lag("YDH_", t)
-        pc_1 = state.lag("PC_", t)
-
-        if ydh > 0 and pc > 0 and ydh_1 > 0 and pc_1 > 0:
-            dln_rydi = math.log(ydh / pc) - math.log(ydh_1 / pc_1)
-        else:
-            dln_rydi = 0.0
-
-        # Real interest rate change
-        rr = state.get("RREAL_", t) if state.has_var("RREAL_") else 0.0
-        rr_1 = state.lag("RREAL_", t) if state.has_var("RREAL_") else 0.0
-        d_rreal = rr - rr_1
-
-        # Unemployment rate change
-        d_ur = state.d("UR_", t)
-
-        # ECM at t-1
-        c_1 = state.lag("C_", t)
-        if c_1 > 0 and ydh_1 > 0 and pc_1 > 0:
-            ecm = math.log(c_1) - scalars.c5 * math.log(ydh_1 / pc_1)
-        else:
-            ecm = 0.0
+        # Real interest rate
+        has_rreal = state.has_var("RREAL_")
+        rr = state.get("RREAL_", t) if has_rreal else 0.0
+        rr_1 = state.lag("RREAL_", t) if has_rreal else 0.0
 
-        # Lagged consumption growth
-        c_2 = state.lag("C_", t, 2) if (t - 2) in state.years else c_1
-        if c_2 > 0 and c_1 > 0:
-            dln_c_lag = math.log(c_1) - math.log(c_2)
-        else:
-            dln_c_lag = 0.0
-
-        dln_c = (
-            scalars.c0
-            + scalars.c1 * dln_rydi
-            + scalars.c2 * d_rreal
-            + scalars.c3 * d_ur
-            + scalars.c4 * ecm
-            + scalars.c6 * dln_c_lag
+        # Consumption two years back (for lagged growth)
+        c_prev = state.lag("C_", t)
+        c_2 = state.lag("C_", t, 2) if (t - 2) in state.years else c_prev
+
+        return consumption_kernel(
+            c_prev, c_2,
+            state.get("YDH_", t), state.lag("YDH_", t),
+            state.get("PC_", t), state.lag("PC_", t),
+            rr, rr_1, state.d("UR_", t),
+            scalars.c0, scalars.c1, scalars.c2, scalars.c3,
+            scalars.c4, scalars.c5, scalars.c6,
         )
-        return c_prev * _safe_exp(dln_c)
 
 
 class BusinessInvestmentEquation(Equation):
@@ -78,45 +59,30 @@ class BusinessInvestmentEquation(Equation):
     name = "IF_"
     equation_type = EquationType.BEHAVIORAL
     depends_on = ["Y_", "PROFIT_", "RREAL_", "ZKF_"]
+    expression = (
+        "business_investment_kernel(IF_[-1], log_diff(Y_, Y_[-1]), Y_[-1],"
+        " PROFIT_, PROFIT_[-1], RREAL_, RREAL_[-1], ZKF_, ZKF_[-1],"
+        " scalars.if0, scalars.if1, scalars.if2, scalars.if3,"
+        " scalars.if4, scalars.if5, scalars.if6)"
+    )
 
     def compute(self, state: SimulationState, t: Year, scalars: ML2Scalars) -> float:
-        if_prev = state.lag("IF_", t)
-        if if_prev <= 0:
-            return if_prev
-
-        dln_y = state.dln("Y_", t)
-
-        # Profitability change
-        profit = state.get("PROFIT_", t) if state.has_var("PROFIT_") else 0.0
-        profit_1 = state.lag("PROFIT_", t) if state.has_var("PROFIT_") else 0.0
-        d_profit = profit - profit_1
-
-        # Real interest rate change
-        rr = state.get("RREAL_", t) if state.has_var("RREAL_") else 0.0
-        rr_1 = state.lag("RREAL_", t) if state.has_var("RREAL_") else 0.0
-        d_rreal = rr - rr_1
+        # Profitability and real interest rate
+        has_profit = state.has_var("PROFIT_")
+        profit = state.get("PROFIT_", t) if has_profit else 0.0
+        profit_1 = state.lag("PROFIT_", t) if has_profit else 0.0
+        has_rreal = state.has_var("RREAL_")
+        rr = state.get("RREAL_", t) if has_rreal else 0.0
+        rr_1 = state.lag("RREAL_", t) if has_rreal else 0.0
 
-        # Capacity utilization change
-        zkf = state.get("ZKF_", t)
-        zkf_1 = state.lag("ZKF_", t)
-        d_zkf = zkf - zkf_1
-
-        # ECM at t-1
         y_1 = state.lag("Y_", t)
-        if if_prev > 0 and y_1 > 0:
-            ecm = math.log(if_prev) - scalars.if6 * math.log(y_1)
-        else:
-            ecm = 0.0
-
-        dln_if = (
-            scalars.if0
-            + scalars.if1 * dln_y
-            + scalars.if2 * d_profit
-            + scalars.if3 * d_rreal
-            + scalars.if4 * d_zkf
-            + scalars.if5 * ecm
+        return business_investment_kernel(
+            state.lag("IF_", t), log_diff(state.get("Y_", t), y_1), y_1,
+            profit, profit_1, rr, rr_1,
+            state.get("ZKF_", t), state.lag("ZKF_", t),
+            scalars.if0, scalars.if1, scalars.if2, scalars.if3,
+            scalars.if4, scalars.if5, scalars.if6,
         )
-        return if_prev * _safe_exp(dln_if)
 
 
 class HousingInvestmentEquation(Equation):
@@ -129,40 +95,24 @@ class HousingInvestmentEquation(Equation):
     name = "IH_"
     equation_type = EquationType.BEHAVIORAL
     depends_on = ["YDH_", "PC_", "RMORT_"]
+    expression = (
+        "housing_investment_kernel(IH_[-1], YDH_, YDH_[-1], PC_, PC_[-1],"
+        " RMORT_, RMORT_[-1], scalars.ih0, scalars.ih1, scalars.ih2, scalars.ih3, scalars.ih4)"
+    )
 
     def compute(self, state: SimulationState, t: Year, scalars: ML2Scalars) -> float:
-        ih_prev = state.lag("IH_", t)
-        if ih_prev <= 0:
-            return ih_prev
-
-        ydh = state.get("YDH_", t)
-        pc = state.get("PC_", t)
-        ydh_1 = state.lag("YDH_", t)
-        pc_1 = state.lag("PC_", t)
-
-        if ydh > 0 and pc > 0 and ydh_1 > 0 and pc_1 > 0:
-            dln_rydi = math.log(ydh / pc) - math.log(ydh_1 / pc_1)
-        else:
-            dln_rydi = 0.0
-
-        # Mortgage rate change
-        rm = state.get("RMORT_", t) if state.has_var("RMORT_") else 0.0
-        rm_1 = state.lag("RMORT_", t) if state.has_var("RMORT_") else 0.0
-        d_rmort = rm - rm_1
-
-        # ECM at t-1
-        if ih_prev > 0 and ydh_1 > 0 and pc_1 > 0:
-            ecm = math.log(ih_prev) - scalars.ih4 * math.log(ydh_1 / pc_1)
-        else:
-            ecm = 0.0
-
-        dln_ih = (
-            scalars.ih0
-            + scalars.ih1 * dln_rydi
-            + scalars.ih2 * d_rmort
-            + scalars.ih3 * ecm
+        # Mortgage rate
+        has_rmort = state.has_var("RMORT_")
+        rm = state.get("RMORT_", t) if has_rmort else 0.0
+        rm_1 = state.lag("RMORT_", t) if has_rmort else 0.0
+
+        return housing_investment_kernel(
+            state.lag("IH_", t),
+            state.get("YDH_", t), state.lag("YDH_", t),
+            state.get("PC_", t), state.lag("PC_", t),
+            rm, rm_1,
+            scalars.ih0, scalars.ih1, scalars.ih2, scalars.ih3, scalars.ih4,
         )
-        return ih_prev * _safe_exp(dln_ih)
 
 
 class ExportVolumeEquation(Equation):
@@ -175,39 +125,30 @@ class ExportVolumeEquation(Equation):
     name = "X_"
     equation_type = EquationType.BEHAVIORAL
     depends_on = ["XWORLD_", "PX_", "PCOMP_"]
+    expression = (
+        "export_volume_kernel(X_[-1], log_diff(XWORLD_, XWORLD_[-1]), XWORLD_[-1],"
+        " PX_, PX_[-1], PCOMP_, PCOMP_[-1],"
+        " scalars.x0, scalars.x1, scalars.x2, scalars.x3, scalars.x4, scalars.x5)"
+    )
 
     def compute(self, state: SimulationState, t: Year, scalars: ML2Scalars) -> float:
-        x_prev = state.lag("X_", t)
-        if x_prev <= 0:
-            return x_prev
-
-        # Foreign demand growth
-        dln_xw = state.dln("XWORLD_", t) if state.has_var("XWORLD_") else scalars.world_growth
-
-        # Relative price change
-        px = state.get("PX_", t)
-        pcomp = state.get("PCOMP_", t) if state.has_var("PCOMP_") else 1.0
-        px_1 = state.lag("PX_", t)
-        pcomp_1 = state.lag("PCOMP_", t) if state.has_var("PCOMP_") else 1.0
-
-        if px > 0 and pcomp > 0 and px_1 > 0 and pcomp_1 > 0:
-            dln_relpx = math.log(px / pcomp) - math.log(px_1 / pcomp_1)
-        else:
-            dln_relpx = 0.0
-
-        # ECM at t-1
-        xw_1 = state.lag("XWORLD_", t) if state.has_var("XWORLD_") else 1.0
-        if x_prev > 0 and xw_1 > 0 and px_1 > 0 and pcomp_1 > 0:
-            ecm = (
-                math.log(x_prev)
-                - scalars.x4 * math.log(xw_1)
-                - scalars.x5 * math.log(px_1 / pcomp_1)
-            )
+        # Foreign demand
+        if state.has_var("XWORLD_"):
+            xw_1 = state.lag("XWORLD_", t)
+            dln_xw = log_diff(state.get("XWORLD_", t), xw_1)
         else:
-            ecm = 0.0
+            xw_1, dln_xw = 1.0, scalars.world_growth
 
-        dln_x = scalars.x0 + scalars.x1 * dln_xw + scalars.x2 * dln_relpx + scalars.x3 * ecm
-        return x_prev * _safe_exp(dln_x)
+        # Competitor prices
+        has_pcomp = state.has_var("PCOMP_")
+        pcomp = state.get("PCOMP_", t) if has_pcomp else 1.0
+        pcomp_1 = state.lag("PCOMP_", t) if has_pcomp else 1.0
+
+        return export_volume_kernel(
+            state.lag("X_", t), dln_xw, xw_1,
+            state.get("PX_", t), state.lag("PX_", t), pcomp, pcomp_1,
+            scalars.x0, scalars.x1, scalars.x2, scalars.x3, scalars.x4, scalars.x5,
+        )
 
 
 class ImportVolumeEquation(Equation):
@@ -220,45 +161,36 @@ class ImportVolumeEquation(Equation):
     name = "M_"
     equation_type = EquationType.BEHAVIORAL
     depends_on = ["DD_", "PM_", "PC_"]
+    expression = (
+        "import_volume_kernel(M_[-1], log_diff(DD_, DD_[-1]), DD_[-1],"
+        " PM_, PM_[-1], PC_, PC_[-1],"
+        " scalars.m0, scalars.m1, scalars.m2, scalars.m3, scalars.m4, scalars.m5)"
+    )
 
     def compute(self, state: SimulationState, t: Year, scalars: ML2Scalars) -> float:
-        m_prev = state.lag("M_", t)
-        if m_prev <= 0:
-            return m_prev
-
-        # Domestic demand growth
-        dln_dd = state.dln("DD_", t) if state.has_var("DD_") else 0.0
-
-        # Relative import price change
-        pm = state.get("PM_", t) if state.has_var("PM_") else 1.0
-        pc = state.get("PC_", t)
-        pm_1 = state.lag("PM_", t) if state.has_var("PM_") else 1.0
-        pc_1 = state.lag("PC_", t)
-
-        if pm > 0 and pc > 0 and pm_1 > 0 and pc_1 > 0:
-            dln_relpm = math.log(pm / pc) - math.log(pm_1 / pc_1)
-        else:
-            dln_relpm = 0.0
-
-        # ECM at t-1
-        dd_1 = state.lag("DD_", t) if state.has_var("DD_") else 1.0
-        if m_prev > 0 and dd_1 > 0 and pm_1 > 0 and pc_1 > 0:
-            ecm = (
-                math.log(m_prev)
-                - scalars.m4 * math.log(dd_1)
-                - scalars.m5 * math.log(pm_1 / pc_1)
-            )
+        # Domestic demand
+        if state.has_var("DD_"):
+            dd_1 = state.lag("DD_", t)
+            dln_dd = log_diff(state.get("DD_", t), dd_1)
         else:
-            ecm = 0.0
+            dd_1, dln_dd = 1.0, 0.0
 
-        dln_m = scalars.m0 + scalars.m1 * dln_dd + scalars.m2 * dln_relpm + scalars.m3 * ecm
-        return m_prev * _safe_exp(dln_m)
+        # Import prices
+        has_pm = state.has_var("PM_")
+        pm = state.get("PM_", t) if has_pm else 1.0
+        pm_1 = state.lag("PM_", t) if has_pm else 1.0
+
+        return import_volume_kernel(
+            state.lag("M_", t), dln_dd, dd_1,
+            pm, pm_1, state.get("PC_", t), state.lag("PC_", t),
+            scalars.m0, scalars.m1, scalars.m2, scalars.m3, scalars.m4, scalars.m5,
+        )
 
 
-BEHAVIORAL_EQUATIONS: list[type[Equation]] = [
+BEHAVIORAL_EQUATIONS: tuple[type[Equation], ...] = (
     ConsumptionEquation,
     BusinessInvestmentEquation,
     HousingInvestmentEquation,
     ExportVolumeEquation,
     ImportVolumeEquation,
-]
+)
@@ -1,5 +1,7 @@
 """Foreign trade equations: nominal exports/imports, trade balance."""
 
+import numpy as np
+
 from ml2.equations.base import Equation
 from ml2.parameters import ML2Scalars
 from ml2.state import SimulationState
@@ -12,10 +14,14 @@ class NominalExportsEquation(Equation):
     name = "XN_"
     equation_type = EquationType.IDENTITY
     depends_on = ["X_", "PX_"]
+    expression = "X_ * PX_"
 
     def compute(self, state: SimulationState, t: Year, scalars: ML2Scalars) -> float:
         return state.get("X_", t) * state.get("PX_", t)
 
+    def compute_vec(self, state: SimulationState, cols: slice, scalars: ML2Scalars) -> np.ndarray:
+        return state.array("X_")[cols] * state.array("PX_")[cols]
+
 
 class NominalImportsEquation(Equation):
     """Nominal imports: MN = M * PM."""
@@ -23,10 +29,14 @@ class NominalImportsEquation(Equation):
     name = "MN_"
     equation_type = EquationType.IDENTITY
     depends_on = ["M_", "PM_"]
+    expression = "M_ * PM_"
 
     def compute(self, state: SimulationState, t: Year, scalars: ML2Scalars) -> float:
         return state.get("M_", t) * state.get("PM_", t)
 
+    def compute_vec(self, state: SimulationState, cols: slice, scalars: ML2Scalars) -> np.ndarray:
+        return state.array("M_")[cols] * state.array("PM_")[cols]
+
 
 class TradeBalanceEquation(Equation):
     """Trade balance: TB = XN - MN."""
@@ -34,10 +44,14 @@ class TradeBalanceEquation(Equation):
     name = "TB_"
     equation_type = EquationType.IDENTITY
     depends_on = ["XN_", "MN_"]
+    expression = "XN_ - MN_"
 
     def compute(self, state: SimulationState, t: Year, scalars: ML2Scalars) -> float:
         return state.get("XN_", t) - state.get("MN_", t)
 
+    def compute_vec(self, state: SimulationState, cols: slice, scalars: ML2Scalars) -> np.ndarray:
+        return state.array("XN_")[cols] - state.array("MN_")[cols]
+
 
 class TradeBalanceRatioEquation(Equation):
     """Trade balance as % of GDP: TBR = TB / GDPN."""
@@ -45,6 +59,7 @@ class TradeBalanceRatioEquation(Equation):
     name = "TBR_"
     equation_type = EquationType.IDENTITY
     depends_on = ["TB_", "GDPN_"]
+    expression = "TB_ / GDPN_ if GDPN_ != 0 else 0.0"
 
     def compute(self, state: SimulationState, t: Year, scalars: ML2Scalars) -> float:
         gdpn = state.get("GDPN_", t)
@@ -52,10 +67,15 @@ class TradeBalanceRatioEquation(Equation):
             return 0.0
         return state.get("TB_", t) / gdpn
 
+    def compute_vec(self, state: SimulationState, cols: slice, scalars: ML2Scalars) -> np.ndarray:
+        gdpn = state.array("GDPN_")[cols]
+        tb = state.array("TB_")[cols]
+        return np.divide(tb, gdpn, out=np.zeros_like(tb), where=gdpn != 0)
+
 
-FOREIGN_EQUATIONS: list[type[Equation]] = [
+FOREIGN_EQUATIONS: tuple[type[Equation], ...] = (
     NominalExportsEquation,
     NominalImportsEquation,
     TradeBalanceEquation,
     TradeBalanceRatioEquation,
-]
+)
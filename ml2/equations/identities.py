@@ -1,7 +1,8 @@
 """Accounting identities: GDP, domestic demand, nominal aggregates, ratios."""
 
-import math
+import numpy as np
 
+from ml2.equations._kernels import disposable_income_kernel
 from ml2.equations.base import Equation, safe_exp
 from ml2.parameters import ML2Scalars
 from ml2.state import SimulationState
@@ -14,6 +15,7 @@ class PublicInvestmentEquation(Equation):
     name = "IG_"
     equation_type = EquationType.TECHNICAL
     depends_on = []
+    expression = "IG_[-1] * (1 + scalars.tfp_growth) + VIG_X / 1000.0"
 
     def compute(self, state: SimulationState, t: Year, scalars: ML2Scalars) -> float:
         ig_prev = state.lag("IG_", t)
@@ -28,6 +30,7 @@ class PublicConsumptionEquation(Equation):
     name = "CG_"
     equation_type = EquationType.IDENTITY
     depends_on = ["WG_", "NG_"]
+    expression = "WG_ * NG_ / 1000.0 + (CG_[-1] - WG_[-1] * NG_[-1] / 1000.0) * (1 + scalars.tfp_growth)"
 
     def compute(self, state: SimulationState, t: Year, scalars: ML2Scalars) -> float:
         wg = state.get("WG_", t)
@@ -43,23 +46,13 @@ class PublicConsumptionEquation(Equation):
         return wage_bill + non_wage_trend
 
 
-class StockChangeEquation(Equation):
-    """Inventory changes: DS = small fraction of GDP, trending."""
-
-    name = "DS_"
-    equation_type = EquationType.TECHNICAL
-    depends_on = ["Y_"]
-
-    def compute(self, state: SimulationState, t: Year, scalars: ML2Scalars) -> float:
-        return state.lag("DS_", t)  # Stock changes ~ stable
-
-
 class DomesticDemandEquation(Equation):
     """Domestic demand: DD = C + IF + IH + IG + CG + DS."""
 
     name = "DD_"
     equation_type = EquationType.IDENTITY
     depends_on = ["C_", "IF_", "IH_", "IG_", "CG_", "DS_"]
+    expression = "C_ + IF_ + IH_ + IG_ + CG_ + DS_"
 
     def compute(self, state: SimulationState, t: Year, scalars: ML2Scalars) -> float:
         return (
@@ -71,6 +64,17 @@ class DomesticDemandEquation(Equation):
             + state.get("DS_", t)
         )
 
+    def compute_vec(self, state: SimulationState, cols: slice, scalars: ML2Scalars) -> np.ndarray:
+        a = state.array
+        return (
+            a("C_")[cols]
+            + a("IF_")[cols]
+            + a("IH_")[cols]
+            + a("IG_")[cols]
+            + a("CG_")[cols]
+            + a("DS_")[cols]
+        )
+
 
 class GDPEquation(Equation):
     """GDP at constant prices (expenditure side): GDP = DD + X - M."""
@@ -78,10 +82,15 @@ class GDPEquation(Equation):
     name = "GDP_"
     equation_type = EquationType.IDENTITY
     depends_on = ["DD_", "X_", "M_"]
+    expression = "DD_ + X_ - M_"
 
     def compute(self, state: SimulationState, t: Year, scalars: ML2Scalars) -> float:
         return state.get("DD_", t) + state.get("X_", t) - state.get("M_", t)
 
+    def compute_vec(self, state: SimulationState, cols: slice, scalars: ML2Scalars) -> np.ndarray:
+        a = state.array
+        return a("DD_")[cols] + a("X_")[cols] - a("M_")[cols]
+
 
 class GDPDeflatorEquation(Equation):
     """GDP deflator: weighted average of component deflators."""
@@ -90,21 +99,26 @@ class GDPDeflatorEquation(Equation):
     equation_type = EquationType.IDENTITY
     depends_on = ["PC_", "PIF_", "PIG_", "PIH_", "PX_", "PM_",
                    "C_", "IF_", "IG_", "IH_", "X_", "M_", "CG_"]
+    expression = (
+        "(C_ * PC_ + IF_ * PIF_ + IH_ * PIH_ + IG_ * PIG_ + PC_ * (CG_ + DS_)"
+        " + X_ * PX_ - M_ * PM_) / GDP_ if GDP_ != 0 else PGDP_[-1]"
+    )
 
     def compute(self, state: SimulationState, t: Year, scalars: ML2Scalars) -> float:
         gdp = state.get("GDP_", t)
         if gdp == 0:
             return state.lag("PGDP_", t)
-        # Nominal GDP / Real GDP
+        get = state.get
+        pc = get("PC_", t)
+        # Nominal GDP / Real GDP; public consumption and stock changes at CPI
         nom = (
-            state.get("C_", t) * state.get("PC_", t)
-            + state.get("IF_", t) * state.get("PIF_", t)
-            + state.get("IH_", t) * state.get("PIH_", t)
-            + state.get("IG_", t) * state.get("PIG_", t)
-            + state.get("CG_", t) * state.get("PC_", t)  # Public consumption at CPI
-            + state.get("X_", t) * state.get("PX_", t)
-            - state.get("M_", t) * state.get("PM_", t)
-            + state.get("DS_", t) * state.get("PC_", t)  # Stock changes at CPI
+            get("C_", t) * pc
+            + get("IF_", t) * get("PIF_", t)
+            + get("IH_", t) * get("PIH_", t)
+            + get("IG_", t) * get("PIG_", t)
+            + pc * (get("CG_", t) + get("DS_", t))
+            + get("X_", t) * get("PX_", t)
+            - get("M_", t) * get("PM_", t)
         )
         return nom / gdp
 
@@ -115,6 +129,7 @@ class NominalGDPEquation(Equation):
     name = "GDPN_"
     equation_type = EquationType.IDENTITY
     depends_on = ["GDP_", "PGDP_"]
+    expression = "GDP_ * PGDP_"
 
     def compute(self, state: SimulationState, t: Year, scalars: ML2Scalars) -> float:
         return state.get("GDP_", t) * state.get("PGDP_", t)
@@ -126,10 +141,15 @@ class TotalInvestmentEquation(Equation):
     name = "I_"
     equation_type = EquationType.IDENTITY
     depends_on = ["IF_", "IH_", "IG_"]
+    expression = "IF_ + IH_ + IG_"
 
     def compute(self, state: SimulationState, t: Year, scalars: ML2Scalars) -> float:
         return state.get("IF_", t) + state.get("IH_", t) + state.get("IG_", t)
 
+    def compute_vec(self, state: SimulationState, cols: slice, scalars: ML2Scalars) -> np.ndarray:
+        a = state.array
+        return a("IF_")[cols] + a("IH_")[cols] + a("IG_")[cols]
+
 
 class ProfitEquation(Equation):
     """Profit rate: PROFIT = (Y - W*L/1000) / (PC*K)."""
@@ -137,16 +157,16 @@ class ProfitEquation(Equation):
     name = "PROFIT_"
     equation_type = EquationType.IDENTITY
     depends_on = ["Y_", "W_", "L_", "PC_", "K_"]
+    expression = "(Y_ - W_ * L_ / 1000.0) / (PC_ * K_) if PC_ * K_ != 0 else PROFIT_[-1]"
 
     def compute(self, state: SimulationState, t: Year, scalars: ML2Scalars) -> float:
+        capital_value = state.get("PC_", t) * state.get("K_", t)
+        if capital_value == 0:
+            return state.lag("PROFIT_", t)
         y = state.get("Y_", t)
         w = state.get("W_", t)
         l = state.get("L_", t)
-        pc = state.get("PC_", t)
-        k = state.get("K_", t)
-        if pc * k == 0:
-            return state.lag("PROFIT_", t)
-        return (y - w * l / 1000.0) / (pc * k)
+        return (y - w * l / 1000.0) / capital_value
 
 
 class RealInterestRateEquation(Equation):
@@ -155,6 +175,7 @@ class RealInterestRateEquation(Equation):
     name = "RREAL_"
     equation_type = EquationType.IDENTITY
     depends_on = ["RNOM_", "PC_"]
+    expression = "RNOM_ - ((PC_ - PC_[-1]) / PC_[-1] if PC_[-1] > 0 else 0.0)"
 
     def compute(self, state: SimulationState, t: Year, scalars: ML2Scalars) -> float:
         rnom = state.get("RNOM_", t) if state.has_var("RNOM_") else scalars.r_nominal
@@ -174,6 +195,7 @@ class MortgageRateEquation(Equation):
     name = "RMORT_"
     equation_type = EquationType.TECHNICAL
     depends_on = ["RNOM_"]
+    expression = "RNOM_ + 0.015"
 
     def compute(self, state: SimulationState, t: Year, scalars: ML2Scalars) -> float:
         rnom = state.get("RNOM_", t) if state.has_var("RNOM_") else scalars.r_nominal
@@ -186,6 +208,8 @@ class LabourForceEquation(Equation):
     name = "NAT_"
     equation_type = EquationType.TECHNICAL
     depends_on = []
+    expression = "NAT_[-1] * (1 + scalars.nat_growth)"
+    trend = "nat_growth"
 
     def compute(self, state: SimulationState, t: Year, scalars: ML2Scalars) -> float:
         return state.lag("NAT_", t) * (1 + scalars.nat_growth)
@@ -197,6 +221,7 @@ class PublicEmploymentEquation(Equation):
     name = "NG_"
     equation_type = EquationType.TECHNICAL
     depends_on = []
+    expression = "NG_[-1] + NG_X"
 
     def compute(self, state: SimulationState, t: Year, scalars: ML2Scalars) -> float:
         ng_prev = state.lag("NG_", t)
@@ -213,36 +238,19 @@ class DisposableIncomeEquation(Equation):
     name = "YDH_"
     equation_type = EquationType.IDENTITY
     depends_on = ["W_", "L_", "WG_", "NG_", "PC_", "DTH_", "TGH_"]
+    expression = "disposable_income_kernel(W_, L_, WG_, NG_, CSSHR_, DTH_X, TGH_)"
 
     def compute(self, state: SimulationState, t: Year, scalars: ML2Scalars) -> float:
-        # Private wage bill
-        w = state.get("W_", t)
-        l = state.get("L_", t)
-        private_wages = w * l / 1000.0  # bn EUR
-
-        # Public wage bill
-        wg = state.get("WG_", t)
-        ng = state.get("NG_", t)
-        public_wages = wg * ng / 1000.0
-
-        total_wages = private_wages + public_wages
-
-        # Effective tax rate (accounting for progressivity)
-        css_emp = state.get("CSSFR_", t) if state.has_var("CSSFR_") else scalars.css_emp_rate
+        # Employee SSC, additional income tax (bn) and transfers
         css_house = state.get("CSSHR_", t) if state.has_var("CSSHR_") else scalars.css_house_rate
-
-        # Net wages after SSC
-        net_wages = total_wages * (1 - css_house)
-
-        # Income tax (as fraction of net wages, ~25% effective rate)
         dth_x = state.get("DTH_X", t) if state.has_var("DTH_X") else 0.0
-        base_tax_rate = 0.25
-        tax = net_wages * base_tax_rate + dth_x / 1000.0  # Additional tax in bn
-
-        # Transfers
         tgh = state.get("TGH_", t) if state.has_var("TGH_") else 0.0
 
-        return net_wages - tax + tgh
+        # Private + public wage bill (bn EUR), net of SSC and ~25% income tax
+        return disposable_income_kernel(
+            state.get("W_", t), state.get("L_", t), state.get("WG_", t), state.get("NG_", t),
+            css_house, dth_x, tgh,
+        )
 
 
 class TransfersEquation(Equation):
@@ -251,6 +259,7 @@ class TransfersEquation(Equation):
     name = "TGH_"
     equation_type = EquationType.TECHNICAL
     depends_on = ["PC_"]
+    expression = "TGH_[-1] * safe_exp(log_diff(PC_, PC_[-1])) * (1 + TGH_X / 100.0)"
 
     def compute(self, state: SimulationState, t: Year, scalars: ML2Scalars) -> float:
         tgh_prev = state.lag("TGH_", t)
@@ -265,6 +274,7 @@ class VATRateEquation(Equation):
     name = "ITPC0R_"
     equation_type = EquationType.TECHNICAL
     depends_on = []
+    expression = "ITPC0R_X"
 
     def compute(self, state: SimulationState, t: Year, scalars: ML2Scalars) -> float:
         if state.has_var("ITPC0R_X"):
@@ -278,6 +288,7 @@ class EmployerSSCRateEquation(Equation):
     name = "CSSFR_"
     equation_type = EquationType.TECHNICAL
     depends_on = []
+    expression = "CSSFR_X / 100.0"
 
     def compute(self, state: SimulationState, t: Year, scalars: ML2Scalars) -> float:
         if state.has_var("CSSFR_X"):
@@ -291,6 +302,7 @@ class EmployeeSSCRateEquation(Equation):
     name = "CSSHR_"
     equation_type = EquationType.TECHNICAL
     depends_on = []
+    expression = "CSSHR_X / 100.0"
 
     def compute(self, state: SimulationState, t: Year, scalars: ML2Scalars) -> float:
         if state.has_var("CSSHR_X"):
@@ -304,6 +316,7 @@ class NominalInterestRateEquation(Equation):
     name = "RNOM_"
     equation_type = EquationType.TECHNICAL
     depends_on = []
+    expression = "RNOM_[-1]"
 
     def compute(self, state: SimulationState, t: Year, scalars: ML2Scalars) -> float:
         return state.lag("RNOM_", t)  # Exogenous, constant
@@ -315,6 +328,8 @@ class WorldDemandEquation(Equation):
     name = "XWORLD_"
     equation_type = EquationType.TECHNICAL
     depends_on = []
+    expression = "XWORLD_[-1] * (1 + scalars.world_growth)"
+    trend = "world_growth"
 
     def compute(self, state: SimulationState, t: Year, scalars: ML2Scalars) -> float:
         return state.lag("XWORLD_", t) * (1 + scalars.world_growth)
@@ -326,6 +341,8 @@ class CompetitorPriceEquation(Equation):
     name = "PCOMP_"
     equation_type = EquationType.TECHNICAL
     depends_on = []
+    expression = "PCOMP_[-1] * (1 + scalars.pcomp_growth)"
+    trend = "pcomp_growth"
 
     def compute(self, state: SimulationState, t: Year, scalars: ML2Scalars) -> float:
         return state.lag("PCOMP_", t) * (1 + scalars.pcomp_growth)
@@ -337,6 +354,7 @@ class WageBillEquation(Equation):
     name = "WB_"
     equation_type = EquationType.IDENTITY
     depends_on = ["W_", "L_", "WG_", "NG_"]
+    expression = "W_ * L_ / 1000.0 + WG_ * NG_ / 1000.0"
 
     def compute(self, state: SimulationState, t: Year, scalars: ML2Scalars) -> float:
         return (
@@ -344,6 +362,13 @@ class WageBillEquation(Equation):
             + state.get("WG_", t) * state.get("NG_", t) / 1000.0
         )
 
+    def compute_vec(self, state: SimulationState, cols: slice, scalars: ML2Scalars) -> np.ndarray:
+        a = state.array
+        return (
+            a("W_")[cols] * a("L_")[cols] / 1000.0
+            + a("WG_")[cols] * a("NG_")[cols] / 1000.0
+        )
+
 
 class ProductivityEquation(Equation):
     """Labour productivity: PROD = Y / LH."""
@@ -351,6 +376,7 @@ class ProductivityEquation(Equation):
     name = "PROD_"
     equation_type = EquationType.IDENTITY
     depends_on = ["Y_", "LH_"]
+    expression = "Y_ / LH_ if LH_ != 0 else PROD_[-1]"
 
     def compute(self, state: SimulationState, t: Year, scalars: ML2Scalars) -> float:
         lh = state.get("LH_", t)
@@ -359,10 +385,9 @@ class ProductivityEquation(Equation):
         return state.get("Y_", t) / lh
 
 
-IDENTITY_EQUATIONS: list[type[Equation]] = [
+IDENTITY_EQUATIONS: tuple[type[Equation], ...] = (
     PublicInvestmentEquation,
     PublicConsumptionEquation,
-    StockChangeEquation,
     DomesticDemandEquation,
     GDPEquation,
     GDPDeflatorEquation,
@@ -383,4 +408,4 @@ IDENTITY_EQUATIONS: list[type[Equation]] = [
     CompetitorPriceEquation,
     WageBillEquation,
     ProductivityEquation,
-]
+)
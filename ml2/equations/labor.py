@@ -1,7 +1,8 @@
 """Labour market equations: LH_, L_, U_, UR_, W_."""
 
-import math
+import numpy as np
 
+from ml2.equations._kernels import labour_hours_kernel, wage_kernel
 from ml2.equations.base import Equation, safe_exp
 from ml2.parameters import ML2Scalars
 from ml2.state import SimulationState
@@ -17,31 +18,18 @@ class LabourHoursEquation(Equation):
     name = "LH_"
     equation_type = EquationType.BEHAVIORAL
     depends_on = ["Y_", "K_", "TFP_"]
+    expression = (
+        "labour_hours_kernel(LH_[-1], Y_, Y_[-1], K_[-1], TFP_[-1],"
+        " scalars.alpha, scalars.lh0, scalars.lh1, scalars.lh2)"
+    )
 
     def compute(self, state: SimulationState, t: Year, scalars: ML2Scalars) -> float:
-        lh_prev = state.lag("LH_", t)
-        if lh_prev <= 0:
-            return lh_prev
-
-        dln_y = state.dln("Y_", t)
-
-        # ECM term at t-1
-        y_1 = state.lag("Y_", t)
-        k_1 = state.lag("K_", t)
-        tfp_1 = state.lag("TFP_", t)
-        lh_1 = lh_prev
-        if y_1 > 0 and k_1 > 0 and tfp_1 > 0 and lh_1 > 0:
-            ecm = (
-                math.log(y_1)
-                - (1 - scalars.alpha) * math.log(k_1)
-                - math.log(tfp_1)
-                - scalars.alpha * math.log(lh_1)
-            )
-        else:
-            ecm = 0.0
-
-        dln_lh = scalars.lh0 + scalars.lh1 * dln_y + scalars.lh2 * ecm
-        return lh_prev * safe_exp(dln_lh)
+        return labour_hours_kernel(
+            state.lag("LH_", t),
+            state.get("Y_", t), state.lag("Y_", t),
+            state.lag("K_", t), state.lag("TFP_", t),
+            scalars.alpha, scalars.lh0, scalars.lh1, scalars.lh2,
+        )
 
 
 class EmploymentEquation(Equation):
@@ -54,6 +42,7 @@ class EmploymentEquation(Equation):
     name = "L_"
     equation_type = EquationType.IDENTITY
     depends_on = ["LH_"]
+    expression = "L_[-1] if LH_[-1] == 0 or L_[-1] == 0 else L_[-1] * (LH_ / LH_[-1])"
 
     def compute(self, state: SimulationState, t: Year, scalars: ML2Scalars) -> float:
         lh = state.get("LH_", t)
@@ -71,10 +60,15 @@ class UnemploymentEquation(Equation):
     name = "U_"
     equation_type = EquationType.IDENTITY
     depends_on = ["NAT_", "L_", "NG_"]
+    expression = "NAT_ - L_ - NG_"
 
     def compute(self, state: SimulationState, t: Year, scalars: ML2Scalars) -> float:
         return state.get("NAT_", t) - state.get("L_", t) - state.get("NG_", t)
 
+    def compute_vec(self, state: SimulationState, cols: slice, scalars: ML2Scalars) -> np.ndarray:
+        a = state.array
+        return a("NAT_")[cols] - a("L_")[cols] - a("NG_")[cols]
+
 
 class UnemploymentRateEquation(Equation):
     """Unemployment rate: UR = U / NAT."""
@@ -82,6 +76,7 @@ class UnemploymentRateEquation(Equation):
     name = "UR_"
     equation_type = EquationType.IDENTITY
     depends_on = ["U_", "NAT_"]
+    expression = "U_ / NAT_ if NAT_ != 0 else 0.0"
 
     def compute(self, state: SimulationState, t: Year, scalars: ML2Scalars) -> float:
         nat = state.get("NAT_", t)
@@ -89,6 +84,11 @@ class UnemploymentRateEquation(Equation):
             return 0.0
         return state.get("U_", t) / nat
 
+    def compute_vec(self, state: SimulationState, cols: slice, scalars: ML2Scalars) -> np.ndarray:
+        nat = state.array("NAT_")[cols]
+        u = state.array("U_")[cols]
+        return np.divide(u, nat, out=np.zeros_like(u), where=nat != 0)
+
 
 class WageEquation(Equation):
     """Private sector wages: Phillips curve + indexation + productivity ECM.
@@ -100,53 +100,26 @@ class WageEquation(Equation):
     name = "W_"
     equation_type = EquationType.BEHAVIORAL
     depends_on = ["PC_", "Y_", "LH_", "L_", "UR_"]
+    expression = (
+        "wage_kernel(W_[-1], PC_, PC_[-1], Y_, LH_, Y_[-1], LH_[-1], UR_, L_[-1],"
+        " WR_X, ZX_X, scalars.nairu,"
+        " scalars.w0, scalars.w1, scalars.w2, scalars.w3, scalars.w4, scalars.w5)"
+    )
 
     def compute(self, state: SimulationState, t: Year, scalars: ML2Scalars) -> float:
-        w_prev = state.lag("W_", t)
-        if w_prev <= 0:
-            return w_prev
-
-        dln_pc = state.dln("PC_", t)
-
-        # Productivity growth
-        y = state.get("Y_", t)
-        lh = state.get("LH_", t)
-        y_1 = state.lag("Y_", t)
-        lh_1 = state.lag("LH_", t)
-        if y > 0 and lh > 0 and y_1 > 0 and lh_1 > 0:
-            dln_prod = math.log(y / lh) - math.log(y_1 / lh_1)
-        else:
-            dln_prod = 0.0
-
-        # Phillips curve: unemployment gap
-        ur = state.get("UR_", t)
-        ur_gap = ur - scalars.nairu
-
-        # Wage share convergence (ECM)
-        l_1 = state.lag("L_", t)
-        pc_1 = state.lag("PC_", t)
-        if y_1 > 0 and pc_1 > 0:
-            ws_1 = (w_prev * l_1) / (pc_1 * y_1 * 1000)  # Adjust units
-        else:
-            ws_1 = scalars.w5
-
-        dln_w = (
-            scalars.w0
-            + scalars.w1 * dln_pc
-            + scalars.w2 * dln_prod
-            + scalars.w3 * ur_gap
-            + scalars.w4 * (ws_1 - scalars.w5)
-        )
-
-        # Apply wage correction instrument if present
+        # Wage correction and indexation instruments, if present
         wr_x = state.get("WR_X", t) if state.has_var("WR_X") else 0.0
-        dln_w += wr_x / 100.0
-
-        # Apply indexation correction
         zx_x = state.get("ZX_X", t) if state.has_var("ZX_X") else 0.0
-        dln_w += zx_x / 100.0
 
-        return w_prev * safe_exp(dln_w)
+        return wage_kernel(
+            state.lag("W_", t),
+            state.get("PC_", t), state.lag("PC_", t),
+            state.get("Y_", t), state.get("LH_", t),
+            state.lag("Y_", t), state.lag("LH_", t),
+            state.get("UR_", t), state.lag("L_", t),
+            wr_x, zx_x, scalars.nairu,
+            scalars.w0, scalars.w1, scalars.w2, scalars.w3, scalars.w4, scalars.w5,
+        )
 
 
 class PublicWageEquation(Equation):
@@ -158,6 +131,7 @@ class PublicWageEquation(Equation):
     name = "WG_"
     equation_type = EquationType.TECHNICAL
     depends_on = ["PC_"]
+    expression = "WG_[-1] * safe_exp(log_diff(PC_, PC_[-1]) + WGRR_X / 100.0)"
 
     def compute(self, state: SimulationState, t: Year, scalars: ML2Scalars) -> float:
         wg_prev = state.lag("WG_", t)
@@ -166,11 +140,11 @@ class PublicWageEquation(Equation):
         return wg_prev * safe_exp(dln_pc + wgrr / 100.0)
 
 
-LABOR_EQUATIONS: list[type[Equation]] = [
+LABOR_EQUATIONS: tuple[type[Equation], ...] = (
     LabourHoursEquation,
     EmploymentEquation,
     UnemploymentEquation,
     UnemploymentRateEquation,
     WageEquation,
     PublicWageEquation,
-]
+)
@@ -1,8 +1,14 @@
 """Price equations: PC_, PIF_, PIG_, PIH_, PX_, COST_, PM_, ULC_."""
 
-import math
-
-from ml2.equations.base import Equation, safe_exp
+import numpy as np
+
+from ml2.equations._kernels import (
+    consumer_price_kernel,
+    cost_deflator_kernel,
+    export_price_kernel,
+    public_investment_deflator_kernel,
+)
+from ml2.equations.base import Equation, log_diff
 from ml2.parameters import ML2Scalars
 from ml2.state import SimulationState
 from ml2.types import EquationType, VarName, Year
@@ -14,6 +20,7 @@ class UnitLabourCostEquation(Equation):
     name = "ULC_"
     equation_type = EquationType.IDENTITY
     depends_on = ["W_", "L_", "Y_"]
+    expression = "W_ * L_ / Y_ if Y_ != 0 else ULC_[-1]"
 
     def compute(self, state: SimulationState, t: Year, scalars: ML2Scalars) -> float:
         y = state.get("Y_", t)
@@ -28,11 +35,16 @@ class MacroCostEquation(Equation):
     name = "COST_"
     equation_type = EquationType.IDENTITY
     depends_on = ["ULC_", "PM_"]
+    expression = "scalars.cost_w * ULC_ + scalars.cost_pm * PM_"
 
     def compute(self, state: SimulationState, t: Year, scalars: ML2Scalars) -> float:
-        ulc = state.get("ULC_", t)
-        pm = state.get("PM_", t) if state.has_var("PM_") else state.lag("PM_", t)
-        return scalars.cost_w * ulc + scalars.cost_pm * pm
+        return scalars.cost_w * state.get("ULC_", t) + scalars.cost_pm * state.get("PM_", t)
+
+    def compute_vec(self, state: SimulationState, cols: slice, scalars: ML2Scalars) -> np.ndarray:
+        return (
+            scalars.cost_w * state.array("ULC_")[cols]
+            + scalars.cost_pm * state.array("PM_")[cols]
+        )
 
 
 class ConsumerPriceEquation(Equation):
@@ -45,42 +57,26 @@ class ConsumerPriceEquation(Equation):
     name = "PC_"
     equation_type = EquationType.BEHAVIORAL
     depends_on = ["COST_", "PM_", "YGAP_", "ITPC0R_"]
+    expression = (
+        "consumer_price_kernel(PC_[-1], COST_, COST_[-1], log_diff(PM_, PM_[-1]), YGAP_,"
+        " ITPC0R_, ITPC0R_[-1], scalars.pc0, scalars.pc1, scalars.pc2, scalars.pc3,"
+        " scalars.pc4, scalars.pc5, scalars.pc_vat)"
+    )
 
     def compute(self, state: SimulationState, t: Year, scalars: ML2Scalars) -> float:
-        pc_prev = state.lag("PC_", t)
-        if pc_prev <= 0:
-            return pc_prev
-
-        # Cost push
-        dln_cost = state.dln("COST_", t)
-
-        # Import price pass-through
-        dln_pm = state.dln("PM_", t) if state.has_var("PM_") else scalars.pm_growth
-
-        # Output gap
-        ygap = state.get("YGAP_", t)
-
-        # ECM at t-1
-        cost_1 = state.lag("COST_", t)
-        if pc_prev > 0 and cost_1 > 0:
-            ecm = math.log(pc_prev) - scalars.pc5 * math.log(cost_1)
+        # VAT rate (pp)
+        if state.has_var("ITPC0R_"):
+            vat, vat_1 = state.get("ITPC0R_", t), state.lag("ITPC0R_", t)
         else:
-            ecm = 0.0
-
-        # VAT effect
-        vat = state.get("ITPC0R_", t) if state.has_var("ITPC0R_") else scalars.vat_rate * 100
-        vat_1 = state.lag("ITPC0R_", t) if state.has_var("ITPC0R_") else scalars.vat_rate * 100
-        d_vat = (vat - vat_1) / 100.0  # Convert from pp to fraction
-
-        dln_pc = (
-            scalars.pc0
-            + scalars.pc1 * dln_cost
-            + scalars.pc2 * dln_pm
-            + scalars.pc3 * ygap
-            + scalars.pc4 * ecm
-            + scalars.pc_vat * d_vat
+            vat = vat_1 = scalars.vat_rate * 100
+
+        return consumer_price_kernel(
+            state.lag("PC_", t),
+            state.get("COST_", t), state.lag("COST_", t),
+            state.dln("PM_", t), state.get("YGAP_", t), vat, vat_1,
+            scalars.pc0, scalars.pc1, scalars.pc2, scalars.pc3,
+            scalars.pc4, scalars.pc5, scalars.pc_vat,
         )
-        return pc_prev * safe_exp(dln_pc)
 
 
 class BusinessInvestmentDeflatorEquation(Equation):
@@ -92,23 +88,17 @@ class BusinessInvestmentDeflatorEquation(Equation):
     name = "PIF_"
     equation_type = EquationType.BEHAVIORAL
     depends_on = ["COST_", "PM_"]
+    expression = (
+        "cost_deflator_kernel(PIF_[-1], COST_, COST_[-1], log_diff(PM_, PM_[-1]),"
+        " scalars.pif1, scalars.pif2, scalars.pif3)"
+    )
 
     def compute(self, state: SimulationState, t: Year, scalars: ML2Scalars) -> float:
-        pif_prev = state.lag("PIF_", t)
-        if pif_prev <= 0:
-            return pif_prev
-
-        dln_cost = state.dln("COST_", t)
-        dln_pm = state.dln("PM_", t) if state.has_var("PM_") else scalars.pm_growth
-
-        cost_1 = state.lag("COST_", t)
-        if pif_prev > 0 and cost_1 > 0:
-            ecm = math.log(pif_prev) - math.log(cost_1)
-        else:
-            ecm = 0.0
-
-        dln_pif = scalars.pif1 * dln_cost + scalars.pif2 * dln_pm + scalars.pif3 * ecm
-        return pif_prev * safe_exp(dln_pif)
+        return cost_deflator_kernel(
+            state.lag("PIF_", t),
+            state.get("COST_", t), state.lag("COST_", t), state.dln("PM_", t),
+            scalars.pif1, scalars.pif2, scalars.pif3,
+        )
 
 
 class HousingInvestmentDeflatorEquation(Equation):
@@ -120,23 +110,17 @@ class HousingInvestmentDeflatorEquation(Equation):
     name = "PIH_"
     equation_type = EquationType.BEHAVIORAL
     depends_on = ["COST_", "PM_"]
+    expression = (
+        "cost_deflator_kernel(PIH_[-1], COST_, COST_[-1], log_diff(PM_, PM_[-1]),"
+        " scalars.pih1, scalars.pih2, scalars.pih3)"
+    )
 
     def compute(self, state: SimulationState, t: Year, scalars: ML2Scalars) -> float:
-        pih_prev = state.lag("PIH_", t)
-        if pih_prev <= 0:
-            return pih_prev
-
-        dln_cost = state.dln("COST_", t)
-        dln_pm = state.dln("PM_", t) if state.has_var("PM_") else scalars.pm_growth
-
-        cost_1 = state.lag("COST_", t)
-        if pih_prev > 0 and cost_1 > 0:
-            ecm = math.log(pih_prev) - math.log(cost_1)
-        else:
-            ecm = 0.0
-
-        dln_pih = scalars.pih1 * dln_cost + scalars.pih2 * dln_pm + scalars.pih3 * ecm
-        return pih_prev * safe_exp(dln_pih)
+        return cost_deflator_kernel(
+            state.lag("PIH_", t),
+            state.get("COST_", t), state.lag("COST_", t), state.dln("PM_", t),
+            scalars.pih1, scalars.pih2, scalars.pih3,
+        )
 
 
 class PublicInvestmentDeflatorEquation(Equation):
@@ -148,15 +132,17 @@ class PublicInvestmentDeflatorEquation(Equation):
     name = "PIG_"
     equation_type = EquationType.TECHNICAL
     depends_on = ["COST_", "PM_"]
+    expression = (
+        "public_investment_deflator_kernel(PIG_[-1], COST_, COST_[-1], log_diff(PM_, PM_[-1]),"
+        " scalars.pig1, scalars.pig2)"
+    )
 
     def compute(self, state: SimulationState, t: Year, scalars: ML2Scalars) -> float:
-        pig_prev = state.lag("PIG_", t)
-        if pig_prev <= 0:
-            return pig_prev
-        dln_cost = state.dln("COST_", t)
-        dln_pm = state.dln("PM_", t) if state.has_var("PM_") else scalars.pm_growth
-        dln_pig = scalars.pig1 * dln_cost + scalars.pig2 * dln_pm
-        return pig_prev * safe_exp(dln_pig)
+        return public_investment_deflator_kernel(
+            state.lag("PIG_", t),
+            state.get("COST_", t), state.lag("COST_", t), state.dln("PM_", t),
+            scalars.pig1, scalars.pig2,
+        )
 
 
 class ExportPriceEquation(Equation):
@@ -168,26 +154,20 @@ class ExportPriceEquation(Equation):
     name = "PX_"
     equation_type = EquationType.BEHAVIORAL
     depends_on = ["COST_", "PCOMP_"]
+    expression = (
+        "export_price_kernel(PX_[-1], COST_, COST_[-1], log_diff(PCOMP_, PCOMP_[-1]),"
+        " PCOMP_[-1], scalars.px1, scalars.px2, scalars.px3)"
+    )
 
     def compute(self, state: SimulationState, t: Year, scalars: ML2Scalars) -> float:
-        px_prev = state.lag("PX_", t)
-        if px_prev <= 0:
-            return px_prev
-
-        dln_cost = state.dln("COST_", t)
-        dln_pcomp = (
-            state.dln("PCOMP_", t) if state.has_var("PCOMP_") else scalars.pcomp_growth
+        pcomp_1 = state.lag("PCOMP_", t)
+        dln_pcomp = log_diff(state.get("PCOMP_", t), pcomp_1)
+        return export_price_kernel(
+            state.lag("PX_", t),
+            state.get("COST_", t), state.lag("COST_", t), dln_pcomp, pcomp_1,
+            scalars.px1, scalars.px2, scalars.px3,
         )
 
-        pcomp_1 = state.lag("PCOMP_", t) if state.has_var("PCOMP_") else 1.0
-        if px_prev > 0 and pcomp_1 > 0:
-            ecm = math.log(px_prev) - math.log(pcomp_1)
-        else:
-            ecm = 0.0
-
-        dln_px = scalars.px1 * dln_cost + scalars.px2 * dln_pcomp + scalars.px3 * ecm
-        return px_prev * safe_exp(dln_px)
-
 
 class ImportPriceEquation(Equation):
     """Import price: exogenous trend growing at pm_growth.
@@ -198,13 +178,15 @@ class ImportPriceEquation(Equation):
     name = "PM_"
     equation_type = EquationType.TECHNICAL
     depends_on = []
+    expression = "PM_[-1] * (1 + scalars.pm_growth)"
+    trend = "pm_growth"
 
     def compute(self, state: SimulationState, t: Year, scalars: ML2Scalars) -> float:
         pm_prev = state.lag("PM_", t)
         return pm_prev * (1 + scalars.pm_growth)
 
 
-PRICE_EQUATIONS: list[type[Equation]] = [
+PRICE_EQUATIONS: tuple[type[Equation], ...] = (
     UnitLabourCostEquation,
     MacroCostEquation,
     ConsumerPriceEquation,
@@ -213,4 +195,4 @@ PRICE_EQUATIONS: list[type[Equation]] = [
     PublicInvestmentDeflatorEquation,
     ExportPriceEquation,
     ImportPriceEquation,
-]
+)
@@ -1,7 +1,8 @@
 """Production block equations: Y_, K_, TFP_, YSTAR_, YGAP_, ZKF_."""
 
-import math
+import numpy as np
 
+from ml2.equations._kernels import output_kernel, potential_output_kernel
 from ml2.equations.base import Equation
 from ml2.parameters import ML2Scalars
 from ml2.state import SimulationState
@@ -14,6 +15,8 @@ class TFPEquation(Equation):
     name = "TFP_"
     equation_type = EquationType.TECHNICAL
     depends_on = []
+    expression = "TFP_[-1] * (1 + scalars.tfp_growth)"
+    trend = "tfp_growth"
 
     def compute(self, state: SimulationState, t: Year, scalars: ML2Scalars) -> float:
         return state.lag("TFP_", t) * (1 + scalars.tfp_growth)
@@ -25,6 +28,7 @@ class CapitalEquation(Equation):
     name = "K_"
     equation_type = EquationType.IDENTITY
     depends_on = ["IF_"]
+    expression = "IF_ + (1 - scalars.delta) * K_[-1]"
 
     def compute(self, state: SimulationState, t: Year, scalars: ML2Scalars) -> float:
         return state.get("IF_", t) + (1 - scalars.delta) * state.lag("K_", t)
@@ -36,14 +40,13 @@ class OutputEquation(Equation):
     name = "Y_"
     equation_type = EquationType.BEHAVIORAL
     depends_on = ["TFP_", "K_", "LH_"]
+    expression = "output_kernel(Y_[-1], TFP_, K_, LH_, scalars.alpha)"
 
     def compute(self, state: SimulationState, t: Year, scalars: ML2Scalars) -> float:
-        tfp = state.get("TFP_", t)
-        k = state.get("K_", t)
-        lh = state.get("LH_", t)
-        if k <= 0 or lh <= 0 or tfp <= 0:
-            return state.lag("Y_", t)
-        return tfp * (k ** (1 - scalars.alpha)) * (lh ** scalars.alpha)
+        return output_kernel(
+            state.lag("Y_", t), state.get("TFP_", t), state.get("K_", t), state.get("LH_", t),
+            scalars.alpha,
+        )
 
 
 class PotentialOutputEquation(Equation):
@@ -52,19 +55,21 @@ class PotentialOutputEquation(Equation):
     name = "YSTAR_"
     equation_type = EquationType.TECHNICAL
     depends_on = ["TFP_", "K_", "NAT_", "NG_"]
+    expression = (
+        "potential_output_kernel(YSTAR_[-1], TFP_, K_, NAT_, NG_, LH_, L_,"
+        " scalars.alpha, scalars.nairu)"
+    )
 
     def compute(self, state: SimulationState, t: Year, scalars: ML2Scalars) -> float:
-        tfp = state.get("TFP_", t)
-        k = state.get("K_", t)
-        # Structural employment = (1 - NAIRU) * NAT - NG
-        nat = state.get("NAT_", t)
-        ng = state.get("NG_", t)
-        l_star = (1 - scalars.nairu) * nat - ng
-        # Average hours ~ proportional to LH/L, assume stable ratio
-        lh_star = l_star * state.get("LH_", t) / max(state.get("L_", t), 1)
-        if k <= 0 or lh_star <= 0:
-            return state.lag("YSTAR_", t)
-        return tfp * (k ** (1 - scalars.alpha)) * (lh_star ** scalars.alpha)
+        # Structural employment = (1 - NAIRU) * NAT - NG, at the current hours
+        # per worker LH/L (assumed a stable ratio)
+        return potential_output_kernel(
+            state.lag("YSTAR_", t),
+            state.get("TFP_", t), state.get("K_", t),
+            state.get("NAT_", t), state.get("NG_", t),
+            state.get("LH_", t), state.get("L_", t),
+            scalars.alpha, scalars.nairu,
+        )
 
 
 class OutputGapEquation(Equation):
@@ -73,6 +78,7 @@ class OutputGapEquation(Equation):
     name = "YGAP_"
     equation_type = EquationType.IDENTITY
     depends_on = ["Y_", "YSTAR_"]
+    expression = "(Y_ - YSTAR_) / YSTAR_ if YSTAR_ != 0 else 0.0"
 
     def compute(self, state: SimulationState, t: Year, scalars: ML2Scalars) -> float:
         ystar = state.get("YSTAR_", t)
@@ -87,6 +93,7 @@ class CapacityUtilizationEquation(Equation):
     name = "ZKF_"
     equation_type = EquationType.IDENTITY
     depends_on = ["Y_", "YSTAR_"]
+    expression = "max(0.80, min(1.10, Y_ / YSTAR_)) if YSTAR_ != 0 else 1.0"
 
     def compute(self, state: SimulationState, t: Year, scalars: ML2Scalars) -> float:
         ystar = state.get("YSTAR_", t)
@@ -95,12 +102,17 @@ class CapacityUtilizationEquation(Equation):
         raw = state.get("Y_", t) / ystar
         return max(0.80, min(1.10, raw))
 
+    def compute_vec(self, state: SimulationState, cols: slice, scalars: ML2Scalars) -> np.ndarray:
+        ystar = state.array("YSTAR_")[cols]
+        zkf = np.divide(state.array("Y_")[cols], ystar, out=np.ones_like(ystar), where=ystar != 0)
+        return np.clip(zkf, 0.80, 1.10, out=zkf)
 
-PRODUCTION_EQUATIONS: list[type[Equation]] = [
+
+PRODUCTION_EQUATIONS: tuple[type[Equation], ...] = (
     TFPEquation,
     CapitalEquation,
     OutputEquation,
     PotentialOutputEquation,
     OutputGapEquation,
     CapacityUtilizationEquation,
-]
+)
@@ -1,5 +1,12 @@
-"""Public finance equations: government receipts, expenditures, deficit, debt."""
+"""Public finance equations: government receipts, expenditures, deficit, debt.
 
+The engine preallocates every registry variable and instrument column
+(SimulationState.preallocate), so these read their inputs unconditionally.
+"""
+
+import numpy as np
+
+from ml2.equations._kernels import government_receipts_kernel
 from ml2.equations.base import Equation
 from ml2.parameters import ML2Scalars
 from ml2.state import SimulationState
@@ -15,35 +22,20 @@ class GovernmentReceiptsEquation(Equation):
     equation_type = EquationType.IDENTITY
     depends_on = ["W_", "L_", "WG_", "NG_", "C_", "PC_", "ITPC0R_",
                    "CSSFR_", "CSSHR_", "GDPN_"]
+    expression = (
+        "government_receipts_kernel(W_, L_, WG_, NG_, CSSFR_, CSSHR_, DTH_X,"
+        " ITPC0R_, C_, PC_, GDPN_)"
+    )
 
     def compute(self, state: SimulationState, t: Year, scalars: ML2Scalars) -> float:
-        # Wage bill (bn EUR)
-        private_wb = state.get("W_", t) * state.get("L_", t) / 1000.0
-        public_wb = state.get("WG_", t) * state.get("NG_", t) / 1000.0
-        total_wb = private_wb + public_wb
-
-        # Employer SSC
-        cssfr = state.get("CSSFR_", t) if state.has_var("CSSFR_") else scalars.css_emp_rate
-        ssc_emp = total_wb * cssfr
-
-        # Employee SSC
-        csshr = state.get("CSSHR_", t) if state.has_var("CSSHR_") else scalars.css_house_rate
-        ssc_house = total_wb * csshr
-
-        # Income tax (progressive, ~25% effective rate on net wages)
-        dth_x = state.get("DTH_X", t) if state.has_var("DTH_X") else 0.0
-        income_tax = total_wb * (1 - csshr) * 0.25 + dth_x / 1000.0
-
-        # VAT revenue
-        vat_rate = state.get("ITPC0R_", t) if state.has_var("ITPC0R_") else scalars.vat_rate * 100
-        consumption_nom = state.get("C_", t) * state.get("PC_", t)
-        vat_revenue = consumption_nom * (vat_rate / 100.0) / (1 + vat_rate / 100.0)
-
-        # Other revenue (~12% of nominal GDP)
-        gdpn = state.get("GDPN_", t)
-        other_revenue = gdpn * 0.12
-
-        return income_tax + vat_revenue + ssc_emp + ssc_house + other_revenue
+        # Income tax (~25% effective on net wages, plus DTH_X bn) + VAT (ITPC0R_ pp)
+        # + SSC (CSSFR_, CSSHR_ rates) + other revenue (~12% of nominal GDP)
+        return government_receipts_kernel(
+            state.get("W_", t), state.get("L_", t), state.get("WG_", t), state.get("NG_", t),
+            state.get("CSSFR_", t), state.get("CSSHR_", t), state.get("DTH_X", t),
+            state.get("ITPC0R_", t),
+            state.get("C_", t), state.get("PC_", t), state.get("GDPN_", t),
+        )
 
 
 class GovernmentExpenditureEquation(Equation):
@@ -54,8 +46,11 @@ class GovernmentExpenditureEquation(Equation):
     name = "GEXPENSE_"
     equation_type = EquationType.IDENTITY
     depends_on = ["CG_", "PC_", "IG_", "PIG_", "TGH_", "B_", "GDPN_"]
+    expression = "CG_ * PC_ + IG_ * PIG_ + TGH_ + B_ * scalars.debt_rate + GDPN_ * 0.08"
 
     def compute(self, state: SimulationState, t: Year, scalars: ML2Scalars) -> float:
+        gdpn = state.get("GDPN_", t)
+
         # Public consumption (nominal)
         cg_nom = state.get("CG_", t) * state.get("PC_", t)
 
@@ -66,13 +61,9 @@ class GovernmentExpenditureEquation(Equation):
         tgh = state.get("TGH_", t)
 
         # Interest payments on debt
-        b = state.get("B_", t) if state.has_var("B_") else (
-            state.get("GDPN_", t) * scalars.debt_gdp
-        )
-        interest = b * scalars.debt_rate
+        interest = state.get("B_", t) * scalars.debt_rate
 
         # Other expenditure (~8% of nominal GDP)
-        gdpn = state.get("GDPN_", t)
         other_exp = gdpn * 0.08
 
         return cg_nom + ig_nom + tgh + interest + other_exp
@@ -84,6 +75,7 @@ class DeficitEquation(Equation):
     name = "D_"
     equation_type = EquationType.IDENTITY
     depends_on = ["GRECEIPTS_", "GEXPENSE_"]
+    expression = "GRECEIPTS_ - GEXPENSE_"
 
     def compute(self, state: SimulationState, t: Year, scalars: ML2Scalars) -> float:
         return state.get("GRECEIPTS_", t) - state.get("GEXPENSE_", t)
@@ -95,6 +87,7 @@ class DebtEquation(Equation):
     name = "B_"
     equation_type = EquationType.IDENTITY
     depends_on = ["D_"]
+    expression = "B_[-1] - D_"
 
     def compute(self, state: SimulationState, t: Year, scalars: ML2Scalars) -> float:
         return state.lag("B_", t) - state.get("D_", t)
@@ -106,6 +99,7 @@ class DeficitRatioEquation(Equation):
     name = "DR_"
     equation_type = EquationType.IDENTITY
     depends_on = ["D_", "GDPN_"]
+    expression = "D_ / GDPN_ if GDPN_ != 0 else 0.0"
 
     def compute(self, state: SimulationState, t: Year, scalars: ML2Scalars) -> float:
         gdpn = state.get("GDPN_", t)
@@ -113,6 +107,11 @@ class DeficitRatioEquation(Equation):
             return 0.0
         return state.get("D_", t) / gdpn
 
+    def compute_vec(self, state: SimulationState, cols: slice, scalars: ML2Scalars) -> np.ndarray:
+        gdpn = state.array("GDPN_")[cols]
+        d = state.array("D_")[cols]
+        return np.divide(d, gdpn, out=np.zeros_like(d), where=gdpn != 0)
+
 
 class DebtRatioEquation(Equation):
     """Debt as % of GDP: BR = B / GDPN."""
@@ -120,6 +119,7 @@ class DebtRatioEquation(Equation):
     name = "BR_"
     equation_type = EquationType.IDENTITY
     depends_on = ["B_", "GDPN_"]
+    expression = "B_ / GDPN_ if GDPN_ != 0 else BR_[-1]"
 
     def compute(self, state: SimulationState, t: Year, scalars: ML2Scalars) -> float:
         gdpn = state.get("GDPN_", t)
@@ -127,12 +127,22 @@ class DebtRatioEquation(Equation):
             return state.lag("BR_", t)
         return state.get("B_", t) / gdpn
 
+    def compute_vec(self, state: SimulationState, cols: slice, scalars: ML2Scalars) -> np.ndarray:
+        # br[0] is the year before the slice; years with GDPN_ == 0 repeat the last ratio
+        gdpn = state.array("GDPN_")[cols]
+        br = state.array("BR_")[cols.start - 1:cols.stop].copy()
+        computed = np.concatenate(([True], gdpn != 0))
+        np.divide(state.array("B_")[cols], gdpn, out=br[1:], where=computed[1:])
+        last = np.where(computed, np.arange(len(br)), 0)
+        np.maximum.accumulate(last, out=last)
+        return br[last[1:]]
+
 
-PUBLIC_FINANCE_EQUATIONS: list[type[Equation]] = [
+PUBLIC_FINANCE_EQUATIONS: tuple[type[Equation], ...] = (
     GovernmentReceiptsEquation,
     GovernmentExpenditureEquation,
     DeficitEquation,
     DebtEquation,
     DeficitRatioEquation,
     DebtRatioEquation,
-]
+)
@@ -1,5 +1,10 @@
 """Equation registry: maps variable names to equations with 3-phase solve order."""
 
+from functools import cache
+from itertools import chain
+
+import numpy as np
+
 from ml2.equations.base import Equation
 from ml2.equations.behavioral import BEHAVIORAL_EQUATIONS
 from ml2.equations.foreign import FOREIGN_EQUATIONS
@@ -8,7 +13,9 @@ from ml2.equations.labor import LABOR_EQUATIONS
 from ml2.equations.prices import PRICE_EQUATIONS
 from ml2.equations.production import PRODUCTION_EQUATIONS
 from ml2.equations.public_finance import PUBLIC_FINANCE_EQUATIONS
-from ml2.types import VarName
+from ml2.parameters import ML2Scalars
+from ml2.state import SimulationState
+from ml2.types import VarName, Year
 
 
 class EquationRegistry:
@@ -25,18 +32,20 @@ class EquationRegistry:
         self._pre_order: list[VarName] = []
         self._inter_order: list[VarName] = []
         self._post_order: list[VarName] = []
+        self._carried_forward: list[VarName] = []
         self._build()
+        self._post_is_terminal = self._no_post_feedback()
 
     def _build(self) -> None:
         """Register all equations and classify into solve phases."""
-        all_eq_classes = (
-            PRODUCTION_EQUATIONS
-            + LABOR_EQUATIONS
-            + BEHAVIORAL_EQUATIONS
-            + PRICE_EQUATIONS
-            + IDENTITY_EQUATIONS
-            + PUBLIC_FINANCE_EQUATIONS
-            + FOREIGN_EQUATIONS
+        all_eq_classes = chain(
+            PRODUCTION_EQUATIONS,
+            LABOR_EQUATIONS,
+            BEHAVIORAL_EQUATIONS,
+            PRICE_EQUATIONS,
+            IDENTITY_EQUATIONS,
+            PUBLIC_FINANCE_EQUATIONS,
+            FOREIGN_EQUATIONS,
         )
 
         for cls in all_eq_classes:
@@ -58,9 +67,12 @@ class EquationRegistry:
             "CSSHR_",     # Employee SSC rate
             "IG_",        # Public investment
             "TGH_",       # Transfers
-            "DS_",        # Stock changes
+            "DS_",        # Stock changes (carried forward, no equation)
         ]
 
+        # PRE variables held at their value in the year before the solve
+        self._carried_forward = ["DS_"]
+
         # Phase 2 (INTER-dependent): iterative Gauss-Seidel block
         # Order designed to minimize iterations (output -> labor -> wages ->
         # prices -> income -> demand -> trade -> GDP -> back to output)
@@ -118,6 +130,47 @@ class EquationRegistry:
     def get(self, var: VarName) -> Equation | None:
         return self._equations.get(var)
 
+    def precompute_pre_phase(
+        self, state: SimulationState, scalars: ML2Scalars, sim_years: list[Year]
+    ) -> list[VarName]:
+        """Write the PRE-phase trends (Equation.trend) for all of sim_years at once.
+
+        Each path is one running product from the year before sim_years, so it
+        matches solving the trend year by year exactly. The trends are independent,
+        so all of them accumulate in one call over a (trends, years) array. Returns
+        the variables written; their equations need not run again for these years.
+        """
+        if not sim_years:
+            return []
+        filled = self.trend_variables(state)
+        if not filled:
+            return []
+        cols = state.year_slice(sim_years)
+        rows = [state.row_index[var] for var in filled]
+        data = state.values
+        factors = np.empty((len(rows), cols.stop - cols.start + 1))
+        factors[:, 0] = data[rows, cols.start - 1]
+        factors[:, 1:] = [[1 + getattr(scalars, self._equations[var].trend)] for var in filled]
+        data[rows, cols] = np.multiply.accumulate(factors, axis=1)[:, 1:]
+        return filled
+
+    def trend_variables(self, state: SimulationState) -> list[VarName]:
+        """PRE variables in state's layout that precompute_pre_phase() fills."""
+        return [
+            var for var in self._pre_order
+            if (eq := self._equations.get(var)) is not None
+            and eq.trend is not None
+            and state.has_var(var)
+        ]
+
+    @property
+    def carried_forward(self) -> list[VarName]:
+        return self._carried_forward
+
+    @property
+    def all_equations(self) -> list[Equation]:
+        return list(self._equations.values())
+
     @property
     def pre_order(self) -> list[VarName]:
         return self._pre_order
@@ -130,9 +183,37 @@ class EquationRegistry:
     def post_order(self) -> list[VarName]:
         return self._post_order
 
+    @property
+    def post_is_terminal(self) -> bool:
+        """True if no PRE/INTER equation depends on a POST variable.
+
+        The post phase then feeds nothing back into later years and can be run
+        once over all years after the year-by-year solve.
+        """
+        return self._post_is_terminal
+
+    def _no_post_feedback(self) -> bool:
+        post = set(self._post_order)
+        return not any(
+            dep in post
+            for var in self._pre_order + self._inter_order
+            if (eq := self._equations.get(var)) is not None
+            for dep in eq.depends_on
+        )
+
     @property
     def all_variables(self) -> list[VarName]:
         return self._pre_order + self._inter_order + self._post_order
 
     def __len__(self) -> int:
         return len(self._equations)
+
+
+@cache
+def get_registry() -> EquationRegistry:
+    """The shared registry, built on first use.
+
+    Equations hold nothing from the state being solved, so one registry serves
+    every engine and solver.
+    """
+    return EquationRegistry()
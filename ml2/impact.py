@@ -2,8 +2,10 @@
 
 from __future__ import annotations
 
+import numpy as np
+
 from ml2.state import SimulationState
-from ml2.types import VarName, Year
+from ml2.types import SeriesMatrix, VarName, Year
 
 # Variables where impact is absolute difference (ratio variables)
 ABSOLUTE_IMPACT_VARS: set[VarName] = {"DR_", "UR_", "BR_", "TBR_", "YGAP_", "ZKF_"}
@@ -14,28 +16,23 @@ def compute_impacts(
     scenario: SimulationState,
     variables: list[VarName],
     sim_years: list[Year],
-) -> dict[VarName, dict[Year, float]]:
+) -> SeriesMatrix:
     """Compute percentage or absolute impacts for each variable/year.
 
     For level variables: ((scenario - baseline) / baseline) * 100
     For ratio variables (DR_, UR_, etc.): (scenario - baseline) * 100  (pp)
     """
-    impacts: dict[VarName, dict[Year, float]] = {}
-
-    for var in variables:
-        impacts[var] = {}
-        for t in sim_years:
-            base_val = baseline.get(var, t)
-            scen_val = scenario.get(var, t)
-
-            if var in ABSOLUTE_IMPACT_VARS:
-                # Absolute difference in percentage points
-                impacts[var][t] = (scen_val - base_val) * 100
-            else:
-                # Percentage deviation
-                if abs(base_val) > 1e-10:
-                    impacts[var][t] = (scen_val - base_val) / base_val * 100
-                else:
-                    impacts[var][t] = 0.0
-
-    return impacts
+    base = baseline.block(variables, sim_years)
+    diff = scenario.block(variables, sim_years) - base
+
+    # Percentage deviation, 0 where the baseline is (near) zero
+    pct = np.zeros_like(diff)
+    np.divide(diff, base, out=pct, where=np.abs(base) > 1e-10)
+    pct *= 100
+
+    # Absolute difference in percentage points
+    absolute = np.fromiter(
+        (var in ABSOLUTE_IMPACT_VARS for var in variables), dtype=bool, count=len(variables)
+    )
+    data = np.where(absolute[:, None], diff * 100, pct)
+    return SeriesMatrix(list(variables), list(sim_years), data)
@@ -4,6 +4,8 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 
+import numpy as np
+
 from ml2.state import SimulationState
 from ml2.types import VarName, Year
 
@@ -114,6 +116,10 @@ INSTRUMENTS: list[InstrumentSpec] = [
 
 INSTRUMENT_MAP: dict[str, InstrumentSpec] = {i.key: i for i in INSTRUMENTS}
 
+# Bounds in INSTRUMENTS order, for validate_instruments_batch()
+_MIN_VALS = np.array([i.min_val for i in INSTRUMENTS])
+_MAX_VALS = np.array([i.max_val for i in INSTRUMENTS])
+
 
 def apply_instruments(
     state: SimulationState,
@@ -128,19 +134,21 @@ def apply_instruments(
     - CSSHR_X -> CSSHR_ (level, CSSHR_ = CSSHR_X / 100)
     - Others are read directly from state by equations
     """
-    for year in sim_years:
-        for key, value in instrument_values.items():
-            if not state.has_var(key):
-                state.add_var(key, 0.0)
-            state.set(key, year, value)
-
-        # Direct mappings
-        if "ITPC0R_X" in instrument_values:
-            state.set("ITPC0R_", year, instrument_values["ITPC0R_X"])
-        if "CSSFR_X" in instrument_values:
-            state.set("CSSFR_", year, instrument_values["CSSFR_X"] / 100.0)
-        if "CSSHR_X" in instrument_values:
-            state.set("CSSHR_", year, instrument_values["CSSHR_X"] / 100.0)
+    if not sim_years:
+        return
+    cols = state.year_slice(sim_years)
+    for key, value in instrument_values.items():
+        if not state.has_var(key):
+            state.add_var(key, 0.0)
+        state.array(key)[cols] = value
+
+    # Direct mappings
+    if "ITPC0R_X" in instrument_values:
+        state.array("ITPC0R_")[cols] = instrument_values["ITPC0R_X"]
+    if "CSSFR_X" in instrument_values:
+        state.array("CSSFR_")[cols] = instrument_values["CSSFR_X"] / 100.0
+    if "CSSHR_X" in instrument_values:
+        state.array("CSSHR_")[cols] = instrument_values["CSSHR_X"] / 100.0
 
 
 def get_default_instruments() -> dict[str, float]:
@@ -159,3 +167,13 @@ def validate_instruments(values: dict[str, float]) -> list[str]:
         if val < spec.min_val or val > spec.max_val:
             errors.append(f"{key}: {val} out of range [{spec.min_val}, {spec.max_val}]")
     return errors
+
+
+def validate_instruments_batch(values: np.ndarray) -> np.ndarray:
+    """Out-of-range mask for many instrument sets at once (e.g. a parameter sweep).
+
+    values has one row per set and one column per instrument, in INSTRUMENTS
+    order; the result has the same shape and is True where a value is out of range.
+    """
+    values = np.asarray(values, dtype=float)
+    return (values < _MIN_VALS) | (values > _MAX_VALS)
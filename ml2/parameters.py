@@ -7,7 +7,7 @@ Parameter names follow ML2 IODE conventions.
 from dataclasses import dataclass
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ML2Scalars:
     # --- Production function ---
     alpha: float = 0.675            # Labour share in Cobb-Douglas
@@ -3,15 +3,46 @@
 from __future__ import annotations
 
 import logging
+from collections.abc import Callable, Sequence
 from dataclasses import dataclass
+from typing import Literal, NamedTuple
 
+import numpy as np
+
+from ml2.codegen import (
+    BatchBlock,
+    Block,
+    BoundExpression,
+    InterBlock,
+    bind_expression,
+    compile_batch,
+    compile_block,
+    compile_inter,
+)
+from ml2.equations._kernels import JIT_AVAILABLE
+from ml2.equations.base import Equation
 from ml2.equations.registry import EquationRegistry
 from ml2.parameters import ML2Scalars
 from ml2.state import SimulationState
-from ml2.types import ConvergenceStatus, Year
+from ml2.types import ConvergenceStatus, VarName, Year
 
 logger = logging.getLogger(__name__)
 
+# One entry of a phase plan
+Step = Equation | BoundExpression
+
+# run(state, data, t, j) for one step; INTER runners also apply the under-relaxation
+Runner = Callable[[SimulationState, np.ndarray, Year, int], None]
+
+# Order of the INTER updates within one iteration
+SweepOrder = Literal["forward", "backward", "symmetric"]
+# How phase 2 drives the sweeps to a fixed point
+SolveMethod = Literal["gauss-seidel", "newton-krylov"]
+# Where phase 2 starts each year: the state's values, or a guess from earlier years
+StartGuess = Literal["data", "previous", "linear"]
+# Newton steps before a year is taken as stalled (a kink in the sweep, e.g. a clamp)
+_NEWTON_STEPS = 15
+
 
 @dataclass
 class YearConvergence:
@@ -21,6 +52,48 @@ class YearConvergence:
     status: ConvergenceStatus
 
 
+class _Schedule(NamedTuple):
+    """The three phases as runners bound to their step, in solve order."""
+
+    pre: tuple[Runner, ...]
+    inter: tuple[Runner, ...]
+    post: tuple[Runner, ...]
+    fused: InterBlock | None = None  # the whole INTER iteration, replacing inter
+    fused_pre: Block | None = None  # PRE as one generated block, replacing pre
+    inter_rows: np.ndarray | None = None  # state rows of the INTER variables, if bound
+
+
+def _pre_runner(step: Step, scalars: ML2Scalars) -> Runner:
+    if isinstance(step, BoundExpression):
+        row, fn = step.row, step.fn
+
+        def run(state: SimulationState, data: np.ndarray, t: Year, j: int) -> None:
+            data[row, j] = fn(data, j)
+    else:
+        name, compute = step.name, step.compute
+
+        def run(state: SimulationState, data: np.ndarray, t: Year, j: int) -> None:
+            state.set(name, t, compute(state, t, scalars))
+    return run
+
+
+def _inter_runner(step: Step, scalars: ML2Scalars, relax: float) -> Runner:
+    """Runner for one under-relaxed update."""
+    keep = 1 - relax
+    if isinstance(step, BoundExpression):
+        row, fn = step.row, step.fn
+
+        def run(state: SimulationState, data: np.ndarray, t: Year, j: int) -> None:
+            data[row, j] = relax * fn(data, j) + keep * data.item(row, j)
+    else:
+        name, compute = step.name, step.compute
+
+        def run(state: SimulationState, data: np.ndarray, t: Year, j: int) -> None:
+            old_val = state.get(name, t)
+            state.set(name, t, relax * compute(state, t, scalars) + keep * old_val)
+    return run
+
+
 class GaussSeidelSolver:
     """Three-phase Gauss-Seidel solver for the ML2 model.
 
@@ -30,6 +103,18 @@ class GaussSeidelSolver:
 
     Convergence criterion: max relative change < eps across all inter variables.
     Under-relaxation: new = relax * computed + (1 - relax) * old.
+
+    order sets how each iteration sweeps the inter variables: "forward" (solve
+    order), "backward" (reversed), or "symmetric" (forward then backward, so an
+    iteration updates every variable twice and its residual spans both halves).
+
+    method="newton-krylov" solves phase 2 with Newton-GMRES on the residual of one
+    sweep instead of repeating sweeps (see _newton_krylov); iterations then count
+    sweeps, the same unit of work as a Gauss-Seidel iteration.
+
+    start sets phase 2's starting point: "data" (the values already in the state,
+    the baseline for a scenario copy), "previous" (last year's solution), or
+    "linear" (extrapolated from the last two years).
     """
 
     def __init__(
@@ -39,59 +124,76 @@ class GaussSeidelSolver:
         relaxation: float = 0.2,
         eps: float = 0.0001,
         max_iter: int = 1000,
+        order: SweepOrder = "forward",
+        method: SolveMethod = "gauss-seidel",
+        start: StartGuess = "data",
     ) -> None:
+        if order not in ("forward", "backward", "symmetric"):
+            raise ValueError(f"unknown sweep order: {order!r}")
+        if method not in ("gauss-seidel", "newton-krylov"):
+            raise ValueError(f"unknown solve method: {method!r}")
+        if start not in ("data", "previous", "linear"):
+            raise ValueError(f"unknown start guess: {start!r}")
         self._registry = registry
         self._scalars = scalars
         self._relaxation = relaxation
         self._eps = eps
         self._max_iter = max_iter
+        self._order = order
+        self._method = method
+        self._start = start
+        # Fused post phase, compiled for one state layout (row_index)
+        self._post_block: tuple[dict, Block | None] | None = None
+        # Batched phases 1-2, compiled for one state layout and skip set
+        self._batch: tuple[dict, frozenset[VarName], BatchBlock] | None = None
+        # Phase runners with bound expressions where they apply (see _plan), cached for
+        # one state layout per skip set.
+        self._plans: dict[frozenset[VarName], tuple[dict, _Schedule]] = {}
 
-    def solve_year(self, state: SimulationState, t: Year) -> YearConvergence:
-        """Solve all equations for a single year t."""
-        # Phase 1: Pre-recursive
-        for var in self._registry.pre_order:
-            eq = self._registry.get(var)
-            if eq is not None:
-                val = eq.compute(state, t, self._scalars)
-                state.set(var, t, val)
-
-        # Phase 2: Iterative Gauss-Seidel
-        status = ConvergenceStatus.MAX_ITERATIONS
-        max_resid = 0.0
-        iterations = 0
-
-        for it in range(1, self._max_iter + 1):
-            max_resid = 0.0
-            for var in self._registry.inter_order:
-                eq = self._registry.get(var)
-                if eq is None:
-                    continue
-
-                old_val = state.get(var, t)
-                new_val = eq.compute(state, t, self._scalars)
+    def solve_year(
+        self, state: SimulationState, t: Year, post: bool = True
+    ) -> YearConvergence:
+        """Solve all equations for a single year t (post=False skips phase 3)."""
+        return self._solve_year(state, t, self._plan(state), post)
 
-                # Under-relaxation
-                relaxed = self._relaxation * new_val + (1 - self._relaxation) * old_val
-                state.set(var, t, relaxed)
+    def _solve_year(
+        self, state: SimulationState, t: Year, schedule: _Schedule, post: bool
+    ) -> YearConvergence:
+        data = state.values
+        j = state.year_col(t)
 
-                # Relative residual
-                if abs(old_val) > 1e-10:
-                    resid = abs(relaxed - old_val) / abs(old_val)
-                else:
-                    resid = abs(relaxed - old_val)
-                max_resid = max(max_resid, resid)
+        # Phase 1: Pre-recursive
+        if schedule.fused_pre is not None:
+            schedule.fused_pre(data, j, j + 1)
+        else:
+            for run in schedule.pre:
+                run(state, data, t, j)
 
-            iterations = it
-            if max_resid < self._eps:
-                status = ConvergenceStatus.CONVERGED
-                break
+        # Phase 2: Iterative Gauss-Seidel
+        inter_rows = schedule.inter_rows
+        if inter_rows is None:
+            inter_rows = state.rows(self._inter_vars())
+        if self._start != "data" and j >= 1:
+            guess = data[inter_rows, j - 1]
+            if self._start == "linear" and j >= 2:
+                guess = 2 * guess - data[inter_rows, j - 2]
+            data[inter_rows, j] = guess
+        if self._method == "newton-krylov":
+            iterations, max_resid, converged = self._newton_krylov(
+                state, t, j, schedule, inter_rows
+            )
+        else:
+            iterations, max_resid, converged = self._gauss_seidel(
+                state, t, j, schedule, inter_rows, self._max_iter
+            )
+        status = (
+            ConvergenceStatus.CONVERGED if converged else ConvergenceStatus.MAX_ITERATIONS
+        )
 
         # Phase 3: Post-recursive
-        for var in self._registry.post_order:
-            eq = self._registry.get(var)
-            if eq is not None:
-                val = eq.compute(state, t, self._scalars)
-                state.set(var, t, val)
+        if post:
+            for run in schedule.post:
+                run(state, data, t, j)
 
         logger.debug(
             "Year %d: %d iterations, max residual=%.6f, status=%s",
@@ -104,10 +206,310 @@ class GaussSeidelSolver:
             status=status,
         )
 
+    def _gauss_seidel(
+        self, state: SimulationState, t: Year, j: int, schedule: _Schedule,
+        inter_rows: np.ndarray, max_iter: int,
+    ) -> tuple[int, float, bool]:
+        """Sweep until converged, compiled if possible: (iterations, max_residual, converged)."""
+        if schedule.fused is not None:
+            return schedule.fused(state.values, j, inter_rows, self._eps, max_iter)
+        return self._iterate(state, t, j, schedule, inter_rows, max_iter)
+
+    def _newton_krylov(
+        self, state: SimulationState, t: Year, j: int, schedule: _Schedule,
+        inter_rows: np.ndarray,
+    ) -> tuple[int, float, bool]:
+        """Phase 2 as Newton-Krylov on the residual of one Gauss-Seidel sweep.
+
+        Solves F(x) = (sweep(x) - x) / scale = 0 for the INTER values x with scipy's
+        matrix-free newton_krylov (GMRES, finite-difference Jacobian-vector products),
+        so the sweep acts as the preconditioner. scale is the starting value (1 where
+        that is ~0), which makes F the residual plain sweeps test against eps. A final
+        sweep from the solution gives the year its values and residual. If Newton
+        stalls, the year falls back to plain sweeps from its starting values.
+        """
+        # Imported here: scipy.optimize is slow to import and only this path uses it
+        from scipy.optimize import NoConvergence, newton_krylov
+
+        data = state.values
+        start = state.column(t, inter_rows)
+        scale = np.abs(start)
+        scale[scale <= 1e-10] = 1.0
+        sweeps = 0
+
+        def sweep(x: np.ndarray) -> np.ndarray:
+            nonlocal sweeps
+            if sweeps == self._max_iter:
+                raise NoConvergence(x)
+            sweeps += 1
+            data[inter_rows, j] = x
+            if schedule.fused is not None:
+                schedule.fused(data, j, inter_rows, -1.0, 1)  # eps < 0: exactly one sweep
+            else:
+                for run in schedule.inter:
+                    run(state, data, t, j)
+            return state.column(t, inter_rows)
+
+        def residual(z: np.ndarray) -> np.ndarray:
+            x = start + z * scale
+            return (sweep(x) - x) / scale
+
+        try:
+            z = newton_krylov(
+                residual, np.zeros_like(start), method="gmres", f_tol=self._eps,
+                maxiter=_NEWTON_STEPS,
+            )
+            x = start + z * scale
+            max_resid = float(np.max(np.abs(sweep(x) - x) / scale, initial=0.0))
+        except (NoConvergence, ValueError, np.linalg.LinAlgError):
+            max_resid = np.inf
+        if max_resid < self._eps:
+            return sweeps, max_resid, True
+
+        logger.debug("Year %d: Newton-Krylov stalled after %d sweeps", t, sweeps)
+        data[inter_rows, j] = start
+        iterations, max_resid, converged = self._gauss_seidel(
+            state, t, j, schedule, inter_rows, self._max_iter
+        )
+        return sweeps + iterations, max_resid, converged
+
+    def _iterate(
+        self, state: SimulationState, t: Year, j: int, schedule: _Schedule,
+        inter_rows: np.ndarray, max_iter: int,
+    ) -> tuple[int, float, bool]:
+        """Run schedule.inter sweeps until converged: (iterations, max_residual, converged)."""
+        data = state.values
+        max_resid = 0.0
+        iterations = 0
+
+        # The residual compares each inter variable before and after a whole sweep
+        # (both halves of a symmetric one). Gathering the block before and after lets
+        # it be computed as one array op.
+        values = state.column(t, inter_rows)
+
+        for it in range(1, max_iter + 1):
+            for run in schedule.inter:
+                run(state, data, t, j)
+
+            # Relative residual (absolute where the old value is ~0)
+            new_values = state.column(t, inter_rows)
+            resid = np.abs(new_values - values)
+            scale = np.abs(values)
+            np.divide(resid, scale, out=resid, where=scale > 1e-10)
+            max_resid = float(resid.max()) if resid.size else 0.0
+            values = new_values
+
+            iterations = it
+            if max_resid < self._eps:
+                return iterations, max_resid, True
+        return iterations, max_resid, False
+
     def solve(self, state: SimulationState, sim_years: list[Year]) -> list[YearConvergence]:
         """Solve the model for all simulation years sequentially."""
+        schedule = self._plan(state, skip=self._fill_ahead(state, sim_years))
+
+        # When nothing in phases 1-2 reads a post variable, phase 3 is run once over
+        # all years at the end, one equation at a time on whole year slices.
+        defer_post = bool(sim_years) and self._registry.post_is_terminal
         results = []
-        for t in sim_years:
-            conv = self.solve_year(state, t)
-            results.append(conv)
+        try:
+            for t in sim_years:
+                state.cache_lags_before(t)
+                conv = self._solve_year(state, t, schedule, post=not defer_post)
+                results.append(conv)
+        finally:
+            state.cache_lags_before(None)
+
+        if defer_post:
+            self._solve_post(state, state.year_slice(sim_years))
+        return results
+
+    def solve_batch(
+        self, states: Sequence[SimulationState], sim_years: list[Year]
+    ) -> list[list[YearConvergence]]:
+        """Solve independent scenarios over the same years, one result list each.
+
+        With Numba, a fused plan and states sharing one layout (copies of the same
+        baseline), phases 1 and 2 of each year run as one generated function over
+        the stacked scenarios, in parallel across them; each scenario gets the same
+        values and convergence as solve(). Otherwise the states are solved in turn.
+        """
+        if not states:
+            return []
+        rows = states[0].row_index
+        batchable = (
+            JIT_AVAILABLE
+            and bool(sim_years)
+            and self._method == "gauss-seidel"
+            and self._start == "data"
+            and self._registry.post_is_terminal
+            and all(state.row_index is rows for state in states)
+        )
+        if not batchable:
+            return [self.solve(state, sim_years) for state in states]
+
+        skips = {self._fill_ahead(state, sim_years) for state in states}
+        skip = next(iter(skips))
+        schedule = self._plan(states[0], skip=skip)
+        pre = self._equations([var for var in self._registry.pre_order if var not in skip])
+        if len(skips) > 1 or schedule.fused is None or (pre and schedule.fused_pre is None):
+            return [self.solve(state, sim_years) for state in states]
+
+        if self._batch is None or self._batch[0] is not rows or self._batch[1] != skip:
+            inter = self._sweep(self._equations(self._registry.inter_order))
+            self._batch = (
+                rows, skip, compile_batch(pre, inter, rows, self._scalars, self._relaxation)
+            )
+        batch = self._batch[2]
+        data = np.stack([state.values for state in states])
+        iterations = np.empty(len(states), dtype=np.int64)
+        residuals = np.empty(len(states))
+        converged = np.empty(len(states), dtype=np.bool_)
+        cols = states[0].year_slice(sim_years)
+        results: list[list[YearConvergence]] = [[] for _ in states]
+        for j, t in enumerate(sim_years, start=cols.start):
+            batch(
+                data, j, schedule.inter_rows, self._eps, self._max_iter,
+                iterations, residuals, converged,
+            )
+            for result, it, resid, ok in zip(results, iterations, residuals, converged):
+                status = (
+                    ConvergenceStatus.CONVERGED if ok else ConvergenceStatus.MAX_ITERATIONS
+                )
+                result.append(YearConvergence(
+                    year=t, iterations=int(it), max_residual=float(resid), status=status,
+                ))
+
+        for state, values in zip(states, data):
+            state.values[...] = values
+            self._solve_post(state, cols)
         return results
+
+    def _fill_ahead(self, state: SimulationState, sim_years: list[Year]) -> frozenset[VarName]:
+        """Fill what does not depend on the solve for all of sim_years: carried
+        forward variables and trends. Returns the PRE variables this leaves done."""
+        if sim_years:
+            cols = state.year_slice(sim_years)
+            for var in self._registry.carried_forward:
+                row = state.array(var)
+                row[cols] = row[cols.start - 1]
+        # Trends are filled for every year up front and dropped from phase 1
+        return frozenset(self._registry.precompute_pre_phase(state, self._scalars, sim_years))
+
+    def _inter_vars(self) -> list[VarName]:
+        return [v for v in self._registry.inter_order if self._registry.get(v) is not None]
+
+    def _equations(self, order: list[VarName]) -> list[Equation]:
+        return [eq for var in order if (eq := self._registry.get(var)) is not None]
+
+    def _sweep(self, inter: list[Equation]) -> list[Equation]:
+        """The INTER equations in the order one iteration updates them."""
+        if self._order == "backward":
+            return inter[::-1]
+        if self._order == "symmetric":
+            return inter + inter[::-1]
+        return inter
+
+    def _build_schedule(
+        self, pre: list[Step], inter: list[Step], post: list[Step]
+    ) -> _Schedule:
+        return _Schedule(
+            pre=tuple(_pre_runner(step, self._scalars) for step in pre),
+            inter=tuple(
+                _inter_runner(step, self._scalars, self._relaxation) for step in inter
+            ),
+            post=tuple(_pre_runner(step, self._scalars) for step in post),
+        )
+
+    def _plan(
+        self, state: SimulationState, skip: frozenset[VarName] = frozenset()
+    ) -> _Schedule:
+        """Schedule for state's layout, without the PRE equations in skip.
+
+        Equations with an expression are bound to the layout's rows.
+        """
+        rows = state.row_index
+        cached = self._plans.get(skip)
+        if cached is not None and cached[0] is rows:
+            return cached[1]
+
+        def bind(eqs: list[Equation]) -> list[Step]:
+            return [bind_expression(eq, rows, self._scalars) or eq for eq in eqs]
+
+        inter = self._sweep(self._equations(self._registry.inter_order))
+        pre = self._equations([var for var in self._registry.pre_order if var not in skip])
+        schedule = self._build_schedule(
+            bind(pre), bind(inter), bind(self._equations(self._registry.post_order))
+        )
+        schedule = schedule._replace(
+            fused=self._fused_inter(state, inter),
+            fused_pre=self._fused_pre(state, pre),
+            inter_rows=state.rows(self._inter_vars()),
+        )
+        self._plans[skip] = (rows, schedule)
+        return schedule
+
+    def compile(self, state: SimulationState) -> None:
+        """Build the generated blocks for state's layout ahead of the first solve.
+
+        Copies of a state share its layout, so compiling against the baseline once
+        covers every scenario solved from it.
+        """
+        # The plan solve() runs, with the precomputed trends left out of phase 1
+        schedule = self._plan(state, skip=frozenset(self._registry.trend_variables(state)))
+        post = self._fused_post(state)
+        # Numba compiles on the first call; make it now, with nothing to iterate
+        data = state.values
+        if schedule.fused is not None:
+            schedule.fused(data, 0, schedule.inter_rows, self._eps, 0)
+        for block in (schedule.fused_pre, post):
+            if block is not None:
+                block(data, 0, 0)
+
+    def _fused_inter(self, state: SimulationState, inter: list[Equation]) -> InterBlock | None:
+        """Phase 2 as one generated function, if Numba is available and every INTER
+        equation has an expression over variables in the layout; None otherwise."""
+        if not (JIT_AVAILABLE and all(eq.expression for eq in inter)):
+            return None
+        try:
+            return compile_inter(inter, state.row_index, self._scalars, self._relaxation)
+        except KeyError:  # an expression reads a variable missing from the layout
+            return None
+
+    def _fused_pre(self, state: SimulationState, pre: list[Equation]) -> Block | None:
+        """Phase 1 as one generated block, run one year column at a time, if Numba is
+        available and every PRE equation has an expression; None otherwise."""
+        if not (pre and JIT_AVAILABLE and all(eq.expression for eq in pre)):
+            return None
+        try:
+            return compile_block(pre, state.row_index, self._scalars)
+        except KeyError:  # an expression reads a variable missing from the layout
+            return None
+
+    def _fused_post(self, state: SimulationState) -> Block | None:
+        """Phase 3 as one generated function, if Numba is available and every post
+        equation has an expression; None otherwise."""
+        post = [eq for var in self._registry.post_order if (eq := self._registry.get(var))]
+        if not (JIT_AVAILABLE and all(eq.expression for eq in post)):
+            return None
+        rows = state.row_index
+        if self._post_block is None or self._post_block[0] is not rows:
+            try:
+                block = compile_block(post, rows, self._scalars)
+            except KeyError:  # an expression reads a variable missing from the layout
+                block = None
+            self._post_block = (rows, block)
+        return self._post_block[1]
+
+    def _solve_post(self, state: SimulationState, cols: slice) -> None:
+        """Phase 3 over a whole slice of years, after the year-by-year solve."""
+        block = self._fused_post(state)
+        if block is not None:
+            block(state.values, cols.start, cols.stop)
+            return
+
+        # One whole-slice NumPy pass per equation
+        for var in self._registry.post_order:
+            eq = self._registry.get(var)
+            if eq is not None:
+                state.array(var)[cols] = eq.compute_vec(state, cols, self._scalars)
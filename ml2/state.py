@@ -3,27 +3,62 @@
 from __future__ import annotations
 
 import math
-from copy import deepcopy
+import sys
+from collections.abc import Iterable, Mapping
 
 import numpy as np
 import pandas as pd
+from numpy.typing import DTypeLike
 
-from ml2.types import VarName, Year
+from ml2.types import SeriesMatrix, VarName, Year
+
+_log = math.log
+
+# Lag caching disabled: no year is before it
+_NO_LAG_CACHE = float("-inf")
 
 
 class SimulationState:
-    """Wraps a pandas DataFrame (index=years, columns=variable names).
+    """Variable time series backed by a 2D NumPy array (rows=variables, columns=years).
 
     Provides IODE-style operators: get, set, lag, dln, grt, d, mavg.
+    Years must be consecutive; scalar access indexes each variable's contiguous row
+    by t - first year. Values are float64 unless another dtype is given (float32
+    halves the array's footprint at ~7 significant digits).
     """
 
-    def __init__(self, df: pd.DataFrame) -> None:
-        self._df = df.copy()
-        self._df.index = self._df.index.astype(int)
+    def __init__(self, df: pd.DataFrame, dtype: DTypeLike = np.float64) -> None:
+        self._init_data(df.to_numpy(dtype=dtype).T, df.index, df.columns)
+
+    @classmethod
+    def from_values(
+        cls, values: np.ndarray, years: Iterable[Year], columns: Iterable[VarName],
+        dtype: DTypeLike = np.float64,
+    ) -> SimulationState:
+        """State over a (variables, years) array whose rows follow columns, without pandas."""
+        new = object.__new__(cls)
+        new._init_data(np.asarray(values, dtype=dtype), years, columns)
+        return new
+
+    def _init_data(
+        self, values: np.ndarray, years: Iterable[Year], columns: Iterable[VarName]
+    ) -> None:
+        self._years: list[Year] = [int(y) for y in years]
+        if self._years != list(range(self._years[0], self._years[0] + len(self._years))):
+            raise ValueError("years must be consecutive")
+        self._year_idx: dict[Year, int] = {y: i for i, y in enumerate(self._years)}
+        self._t0: Year = self._years[0]
+        # Interned, like the name literals equations look up, so lookups hit on identity
+        self._idx: dict[VarName, int] = {sys.intern(var): i for i, var in enumerate(columns)}
+        if values.shape != (len(self._idx), len(self._years)):
+            raise ValueError("values must have one row per variable and one column per year")
+        self._data: np.ndarray = np.ascontiguousarray(values)
+        self._init_rows()
+        self._init_lag_cache()
 
     @property
     def years(self) -> list[Year]:
-        return list(self._df.index)
+        return list(self._years)
 
     @property
     def sim_years(self) -> list[Year]:
@@ -32,65 +67,226 @@ class SimulationState:
 
     @property
     def columns(self) -> list[VarName]:
-        return list(self._df.columns)
+        return list(self._idx)
 
     @property
     def df(self) -> pd.DataFrame:
-        return self._df
+        """Snapshot of the state as a DataFrame (index=years, columns=variables)."""
+        return pd.DataFrame(
+            self._data.T,
+            index=pd.Index(self._years, name="year"),
+            columns=self.columns,
+        )
+
+    @property
+    def dtype(self) -> np.dtype:
+        return self._data.dtype
+
+    @property
+    def values(self) -> np.ndarray:
+        """The (n_vars, n_years) backing array; rows are given by row_index."""
+        return self._data
+
+    @property
+    def row_index(self) -> dict[VarName, int]:
+        """Variable -> row of values. Shared between copies; do not mutate."""
+        return self._idx
 
     def get(self, var: VarName, t: Year) -> float:
         """Get variable value at year t."""
-        return float(self._df.at[t, var])
+        return float(self._rows[var][self._offset(t)])
 
     def set(self, var: VarName, t: Year, value: float) -> None:
         """Set variable value at year t."""
-        self._df.at[t, var] = value
+        self._rows[var][self._offset(t)] = value
+        if t < self._lags_before:
+            self._lags.clear()
 
     def lag(self, var: VarName, t: Year, n: int = 1) -> float:
         """Get lagged value: var[t-n]."""
-        return float(self._df.at[t - n, var])
+        s = t - n
+        i = self._offset(s)  # before the memo, so both paths reject the same years
+        if s < self._lags_before:
+            key = (var, s)
+            value = self._lags.get(key)
+            if value is None:
+                value = self._lags[key] = float(self._rows[var][i])
+            return value
+        return float(self._rows[var][i])
+
+    def cache_lags_before(self, t: Year | None) -> None:
+        """Memoize lag() reads of years before t (None stops caching).
+
+        The solver works forward one year at a time, so while it solves year t the
+        earlier years are fixed and every equation reading, say, PC_[-1] can share
+        one lookup. set() on an earlier year drops the cache; writes made through
+        array() views are not seen, so stop caching before making any.
+        """
+        self._lags.clear()
+        self._lags_before = _NO_LAG_CACHE if t is None else t
+
+    def _init_lag_cache(self) -> None:
+        self._lags: dict[tuple[VarName, Year], float] = {}
+        self._lags_before: float = _NO_LAG_CACHE
 
     def dln(self, var: VarName, t: Year) -> float:
         """First difference of log: ln(X_t) - ln(X_{t-1})."""
-        cur = self.get(var, t)
-        prev = self.lag(var, t, 1)
+        # Read both values from the variable's row directly (one name lookup)
+        row = self._rows[var]
+        i = self._col(t)
+        cur = float(row[i])
+        prev = float(row[i - 1])
         if cur <= 0 or prev <= 0:
             return 0.0
-        return math.log(cur) - math.log(prev)
+        return _log(cur / prev)
 
     def grt(self, var: VarName, t: Year) -> float:
         """Growth rate: (X_t - X_{t-1}) / X_{t-1} * 100."""
-        prev = self.lag(var, t, 1)
+        row = self._rows[var]
+        i = self._col(t)
+        prev = float(row[i - 1])
         if prev == 0:
             return 0.0
-        return (self.get(var, t) - prev) / prev * 100.0
+        return (float(row[i]) - prev) / prev * 100.0
 
     def d(self, var: VarName, t: Year) -> float:
         """First difference: X_t - X_{t-1}."""
-        return self.get(var, t) - self.lag(var, t, 1)
+        row = self._rows[var]
+        i = self._col(t)
+        return float(row[i]) - float(row[i - 1])
 
     def mavg(self, var: VarName, t: Year, n: int = 3) -> float:
-        """Moving average over n years ending at t."""
-        vals = [self.get(var, t - i) for i in range(n) if (t - i) in self._df.index]
-        return float(np.mean(vals)) if vals else 0.0
+        """Moving average over n years ending at t (those of them in the state)."""
+        start = max(t - n + 1 - self._t0, 0)
+        stop = min(t - self._t0 + 1, len(self._years))
+        if start >= stop:
+            return 0.0
+        return float(self._rows[var][start:stop].mean(dtype=np.float64))
+
+    def series(self, var: VarName, years: list[Year]) -> np.ndarray:
+        """Values of var over the given years (vectorized get)."""
+        return self._data[self._idx[var], self._year_cols(years)]
+
+    def grt_series(self, var: VarName, years: list[Year]) -> np.ndarray:
+        """Growth rates of var over the given years (vectorized grt)."""
+        cols = self._year_cols(years)
+        row = self._data[self._idx[var]]
+        cur, prev = row[cols], row[cols - 1]
+        growth = np.divide(cur - prev, prev, out=np.zeros_like(cur), where=prev != 0)
+        return growth * 100.0
+
+    def array(self, var: VarName) -> np.ndarray:
+        """The variable's year vector (a writable view of the backing array)."""
+        return self._rows[var]
+
+    def year_col(self, t: Year) -> int:
+        """Column of year t in values."""
+        return self._year_idx[t]
+
+    def year_slice(self, years: list[Year]) -> slice:
+        """Column slice covering consecutive years, for indexing array()."""
+        start = self._year_idx[years[0]]
+        stop = self._year_idx[years[-1]] + 1
+        if stop - start != len(years):
+            raise ValueError("years must be consecutive")
+        return slice(start, stop)
+
+    def rows(self, variables: list[VarName]) -> np.ndarray:
+        """Row positions of variables in the backing array, for use with column()."""
+        return np.fromiter((self._idx[var] for var in variables), dtype=np.intp, count=len(variables))
+
+    def column(self, t: Year, rows: np.ndarray) -> np.ndarray:
+        """Values of the given variable rows at year t (a copy)."""
+        return self._data[rows, self._year_idx[t]]
+
+    def block(self, variables: list[VarName], years: list[Year]) -> np.ndarray:
+        """(len(variables), len(years)) array of values (a copy)."""
+        return self._data[np.ix_(self.rows(variables), self._year_cols(years))]
+
+    def matrix(self, variables: list[VarName] | None = None) -> SeriesMatrix:
+        """Values of the given variables over all years; unknown names are skipped."""
+        cols = [var for var in (variables if variables else self.columns) if var in self._idx]
+        return SeriesMatrix(cols, list(self._years), self._data[self.rows(cols)])
+
+    def _offset(self, t: Year) -> int:
+        """Position of year t in a row; KeyError if t is not a year of the state.
+
+        Checked, as a negative offset would otherwise wrap to the end of the row.
+        """
+        i = t - self._t0
+        if not 0 <= i < len(self._years):
+            raise KeyError(t)
+        return i
+
+    def _col(self, t: Year) -> int:
+        """Column of year t, which must have a previous year in the state."""
+        i = t - self._t0
+        if i < 1:
+            raise KeyError(t - 1)
+        return i
+
+    def _init_rows(self) -> None:
+        # Per-variable views of _data; rebuilt whenever _data is replaced
+        self._rows: dict[VarName, np.ndarray] = dict(zip(self._idx, self._data))
+
+    def _year_cols(self, years: list[Year]) -> np.ndarray:
+        return np.fromiter((self._year_idx[t] for t in years), dtype=np.intp, count=len(years))
 
     def has_var(self, var: VarName) -> bool:
-        return var in self._df.columns
+        return var in self._idx
 
     def add_var(self, var: VarName, default: float = 0.0) -> None:
         """Add a new variable with a default value for all years."""
-        if var not in self._df.columns:
-            self._df[var] = default
+        if var not in self._idx:
+            row = np.full((1, len(self._years)), default, dtype=self._data.dtype)
+            self._data = np.vstack([self._data, row])
+            # Copy-on-write: the index dict may be shared with other copies
+            self._idx = {**self._idx, sys.intern(var): len(self._idx)}
+            self._init_rows()
+
+    def preallocate(
+        self, variables: Iterable[VarName], defaults: Mapping[VarName, float] | None = None
+    ) -> None:
+        """Add every missing variable, valued defaults.get(var, 0.0) for all years.
+
+        Unlike repeated add_var(), the backing array is reallocated once.
+        """
+        defaults = defaults or {}
+        new = [sys.intern(var) for var in dict.fromkeys(variables) if var not in self._idx]
+        if not new:
+            return
+        fill = np.array([defaults.get(var, 0.0) for var in new], dtype=self._data.dtype)
+        rows = np.repeat(fill[:, None], len(self._years), axis=1)
+        self._data = np.vstack([self._data, rows])
+        n = len(self._idx)
+        self._idx = {**self._idx, **{var: n + i for i, var in enumerate(new)}}
+        self._init_rows()
 
     def copy(self) -> SimulationState:
-        """Deep copy of the state."""
-        return SimulationState(self._df.copy(deep=True))
+        """Copy of the state: values are copied, index dicts are shared."""
+        new = object.__new__(SimulationState)
+        new._years = self._years
+        new._year_idx = self._year_idx
+        new._t0 = self._t0
+        new._idx = self._idx
+        new._data = self._data.copy()
+        new._init_rows()
+        new._init_lag_cache()
+        return new
+
+    def readonly(self) -> SimulationState:
+        """View of the state that shares its values but rejects writes."""
+        new = object.__new__(SimulationState)
+        new._years = self._years
+        new._year_idx = self._year_idx
+        new._t0 = self._t0
+        new._idx = self._idx
+        new._data = self._data.view()
+        new._data.flags.writeable = False
+        new._init_rows()
+        new._init_lag_cache()
+        return new
 
     def to_dict(self, variables: list[VarName] | None = None) -> dict[str, dict[Year, float]]:
         """Convert to nested dict {var: {year: value}}."""
-        cols = variables if variables else self.columns
-        return {
-            var: {int(yr): float(self._df.at[yr, var]) for yr in self.years}
-            for var in cols
-            if var in self._df.columns
-        }
+        return self.matrix(variables).to_dict()
@@ -1,8 +1,13 @@
 """Enums and type aliases for the ML2 model."""
 
+from __future__ import annotations
+
+from dataclasses import dataclass
 from enum import Enum, auto
 from typing import TypeAlias
 
+import numpy as np
+
 Year: TypeAlias = int
 VarName: TypeAlias = str
 
@@ -24,3 +29,25 @@ class ConvergenceStatus(Enum):
     CONVERGED = auto()
     MAX_ITERATIONS = auto()
     DIVERGED = auto()
+
+
+@dataclass
+class SeriesMatrix:
+    """Year series for several variables as one (n_vars, n_years) array.
+
+    Row i of data holds variables[i]; column j holds years[j].
+    """
+
+    variables: list[VarName]
+    years: list[Year]
+    data: np.ndarray
+
+    def row(self, var: VarName) -> np.ndarray:
+        return self.data[self.variables.index(var)]
+
+    def to_dict(self) -> dict[VarName, dict[Year, float]]:
+        """Nested {var: {year: value}} dict, built only at the API boundary."""
+        return {
+            var: dict(zip(self.years, row))
+            for var, row in zip(self.variables, self.data.tolist())
+        }
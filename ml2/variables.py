@@ -5,7 +5,8 @@ from __future__ import annotations
 import json
 from pathlib import Path
 
-import pandas as pd
+import numpy as np
+from numpy.typing import DTypeLike
 
 from ml2.state import SimulationState
 from ml2.types import VarName
@@ -45,20 +46,20 @@ class BaselineDataLoader:
     def __init__(self, data_dir: Path | None = None) -> None:
         self._data_dir = data_dir or DATA_DIR
 
-    def load_state(self) -> SimulationState:
-        """Load baseline variables into a SimulationState."""
+    def load_state(self, dtype: DTypeLike = np.float64) -> SimulationState:
+        """Load baseline variables into a SimulationState with values of the given dtype."""
         path = self._data_dir / "baseline_variables.json"
         with open(path) as f:
             data = json.load(f)
 
-        # Convert to DataFrame: {var: {year_str: value}} -> DataFrame
-        records: dict[str, dict[int, float]] = {}
-        for var, series in data.items():
-            records[var] = {int(yr): float(val) for yr, val in series.items()}
-
-        df = pd.DataFrame(records)
-        df.index.name = "year"
-        return SimulationState(df)
+        # {var: {year_str: value}} -> (variables, years) array, NaN where a year is missing
+        years = sorted({int(yr) for series in data.values() for yr in series})
+        col = {yr: i for i, yr in enumerate(years)}
+        values = np.full((len(data), len(years)), np.nan)
+        for row, series in zip(values, data.values()):
+            for yr, val in series.items():
+                row[col[int(yr)]] = float(val)
+        return SimulationState.from_values(values, years, data, dtype)
 
     def load_scalars(self) -> dict[str, float]:
         """Load scalar parameters from JSON."""
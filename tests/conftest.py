@@ -9,12 +9,12 @@ from ml2.solver import GaussSeidelSolver
 from ml2.variables import BaselineDataLoader
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def scalars():
     return ML2Scalars()
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def registry():
     return EquationRegistry()
 
@@ -30,8 +30,10 @@ def solver(registry, scalars):
     return GaussSeidelSolver(registry, scalars)
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def engine():
+    """One loaded engine for the session; simulate() never modifies it, and
+    baseline_state hands each test its own copy."""
     eng = SimulationEngine()
     eng.load_baseline()
     return eng
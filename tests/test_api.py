@@ -1,22 +1,30 @@
 """Tests for the FastAPI endpoints."""
 
+import io
+import zipfile
+
 import pytest
 from fastapi.testclient import TestClient
 
 from api.main import app
 
-client = TestClient(app)
+
+@pytest.fixture(scope="module")
+def client():
+    """Test client with the app lifespan running (engine and limiter initialized)."""
+    with TestClient(app) as c:
+        yield c
 
 
 class TestHealthCheck:
-    def test_health(self):
+    def test_health(self, client):
         response = client.get("/health")
         assert response.status_code == 200
         assert response.json()["status"] == "ok"
 
 
 class TestBaseline:
-    def test_get_baseline(self):
+    def test_get_baseline(self, client):
         response = client.get("/baseline")
         assert response.status_code == 200
         data = response.json()
@@ -27,7 +35,7 @@ class TestBaseline:
 
 
 class TestInstruments:
-    def test_get_instruments(self):
+    def test_get_instruments(self, client):
         response = client.get("/instruments")
         assert response.status_code == 200
         specs = response.json()
@@ -36,7 +44,7 @@ class TestInstruments:
 
 
 class TestSimulate:
-    def test_simulate_default(self):
+    def test_simulate_default(self, client):
         response = client.post("/simulate", json={"instruments": {}})
         assert response.status_code == 200
         data = response.json()
@@ -45,7 +53,7 @@ class TestSimulate:
         assert "convergence" in data
         assert "impacts" in data
 
-    def test_simulate_with_instrument(self):
+    def test_simulate_with_instrument(self, client):
         response = client.post(
             "/simulate",
             json={"name": "Test", "instruments": {"VIG_X": 1000}},
@@ -55,7 +63,7 @@ class TestSimulate:
         assert data["name"] == "Test"
         assert data["instruments"]["VIG_X"] == 1000
 
-    def test_simulate_invalid_instrument(self):
+    def test_simulate_invalid_instrument(self, client):
         response = client.post(
             "/simulate",
             json={"instruments": {"INVALID": 42}},
@@ -64,7 +72,7 @@ class TestSimulate:
 
 
 class TestExport:
-    def test_export_csv(self):
+    def test_export_csv(self, client):
         response = client.post(
             "/export/csv",
             json={"name": "test", "instruments": {}},
@@ -73,10 +81,24 @@ class TestExport:
         assert "text/csv" in response.headers["content-type"]
         assert len(response.content) > 100
 
-    def test_export_excel(self):
+    def test_export_excel(self, client):
         response = client.post(
             "/export/excel",
             json={"name": "test", "instruments": {}},
         )
         assert response.status_code == 200
         assert "spreadsheet" in response.headers["content-type"]
+        with zipfile.ZipFile(io.BytesIO(response.content)) as zf:
+            assert "xl/worksheets/sheet1.xml" in zf.namelist()
+
+    def test_export_excel_fast(self, client):
+        response = client.post(
+            "/export/excel?fast=1",
+            json={"name": "test", "instruments": {"VIG_X": 1000}},
+        )
+        assert response.status_code == 200
+        assert "spreadsheet" in response.headers["content-type"]
+        with zipfile.ZipFile(io.BytesIO(response.content)) as zf:
+            names = zf.namelist()
+        assert "xl/worksheets/sheet1.xml" in names
+        assert "xl/worksheets/sheet2.xml" in names
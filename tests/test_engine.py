@@ -1,7 +1,11 @@
 """Tests for the simulation engine."""
 
+import numpy as np
 import pytest
 
+from ml2.engine import SimulationEngine
+from ml2.instruments import INSTRUMENTS, validate_instruments, validate_instruments_batch
+
 
 class TestBaselineReproduction:
     """Test that baseline indicators match known trajectories."""
@@ -99,9 +103,31 @@ class TestEngineAPI:
         with pytest.raises(ValueError, match="out of range"):
             engine.simulate({"VIG_X": 999999})
 
+    def test_batch_validation_matches_single(self):
+        keys = [spec.key for spec in INSTRUMENTS]
+        rows = np.array([
+            [spec.default for spec in INSTRUMENTS],
+            [spec.min_val - 1 for spec in INSTRUMENTS],
+            [spec.max_val for spec in INSTRUMENTS],
+        ])
+        mask = validate_instruments_batch(rows)
+        assert mask.shape == rows.shape
+        for row, bad in zip(rows, mask):
+            errors = validate_instruments(dict(zip(keys, row)))
+            assert len(errors) == bad.sum()
+
     def test_instrument_specs(self, engine):
         specs = engine.get_instrument_specs()
         assert len(specs) == 10
         keys = {s["key"] for s in specs}
         assert "VIG_X" in keys
         assert "ITPC0R_X" in keys
+
+    def test_float32_state_tracks_float64(self, engine):
+        engine32 = SimulationEngine(dtype=np.float32)
+        engine32.load_baseline()
+        assert engine32.baseline.dtype == np.float32
+        result32 = engine32.simulate({"VIG_X": 500})
+        result = engine.simulate({"VIG_X": 500})
+        assert all(c["status"] == "CONVERGED" for c in result32.convergence)
+        np.testing.assert_allclose(result32.levels.data, result.levels.data, rtol=1e-4)
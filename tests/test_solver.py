@@ -1,5 +1,18 @@
 """Tests for the Gauss-Seidel solver."""
 
+import math
+import os
+
+import numpy as np
+
+from ml2 import codegen
+from ml2 import solver as solver_module
+from ml2.codegen import bind_expression, compile_block
+from ml2.equations._kernels import cost_deflator_kernel
+from ml2.equations.base import Equation
+from ml2.instruments import apply_instruments, get_default_instruments
+from ml2.solver import GaussSeidelSolver
+from ml2.state import SimulationState
 from ml2.types import ConvergenceStatus
 
 
@@ -34,3 +47,201 @@ class TestSolverConvergence:
             assert conv.max_residual < 0.001, (
                 f"Year {conv.year} residual too large: {conv.max_residual}"
             )
+
+    def test_symmetric_sweeps_converge_in_fewer_iterations(
+        self, solver, registry, scalars, baseline_state
+    ):
+        symmetric = baseline_state.copy()
+        sim_years = baseline_state.sim_years
+        forward = solver.solve(baseline_state, sim_years)
+        results = GaussSeidelSolver(registry, scalars, order="symmetric").solve(symmetric, sim_years)
+        assert all(conv.status == ConvergenceStatus.CONVERGED for conv in results)
+        assert sum(c.iterations for c in results) < sum(c.iterations for c in forward)
+        np.testing.assert_allclose(
+            symmetric.series("GDP_", sim_years), baseline_state.series("GDP_", sim_years),
+            rtol=1e-2,
+        )
+
+    def test_warm_starts_save_iterations(self, solver, registry, scalars, baseline_state):
+        sim_years = baseline_state.sim_years
+        warm = {start: baseline_state.copy() for start in ("previous", "linear")}
+        cold = solver.solve(baseline_state, sim_years)
+        for start, state in warm.items():
+            results = GaussSeidelSolver(registry, scalars, start=start).solve(state, sim_years)
+            assert all(conv.status == ConvergenceStatus.CONVERGED for conv in results)
+            assert sum(c.iterations for c in results) < sum(c.iterations for c in cold), start
+            np.testing.assert_allclose(
+                state.series("GDP_", sim_years), baseline_state.series("GDP_", sim_years),
+                rtol=1e-2,
+            )
+
+    def test_newton_krylov_matches_sweeps(self, solver, registry, scalars, baseline_state):
+        newton = baseline_state.copy()
+        sim_years = baseline_state.sim_years
+        solver.solve(baseline_state, sim_years)
+        results = GaussSeidelSolver(registry, scalars, method="newton-krylov").solve(
+            newton, sim_years
+        )
+        assert all(conv.status == ConvergenceStatus.CONVERGED for conv in results)
+        np.testing.assert_allclose(
+            newton.series("GDP_", sim_years), baseline_state.series("GDP_", sim_years),
+            rtol=1e-2,
+        )
+
+    def test_solve_batch_matches_solve(self, solver, baseline_state):
+        sim_years = baseline_state.sim_years
+        scenarios = []
+        for vat in (21.0, 23.0, 25.0):
+            state = baseline_state.copy()
+            apply_instruments(state, {**get_default_instruments(), "ITPC0R_X": vat}, sim_years)
+            scenarios.append(state)
+        batched = [state.copy() for state in scenarios]
+        expected = [solver.solve(state, sim_years) for state in scenarios]
+        assert solver.solve_batch(batched, sim_years) == expected
+        for state, batch_state in zip(scenarios, batched):
+            np.testing.assert_array_equal(batch_state.values, state.values)
+
+    def test_solve_year_follows_the_state_layout(self, registry, scalars, baseline_state):
+        sim_years = baseline_state.sim_years
+        columns = baseline_state.columns[::-1]
+        reordered = SimulationState.from_values(
+            baseline_state.values[::-1], baseline_state.years, columns
+        )
+        expected = baseline_state.copy()
+        solver = GaussSeidelSolver(registry, scalars)
+        for t in sim_years:  # on a fresh solver
+            solver.solve_year(baseline_state, t)
+        solver.solve(expected, sim_years)
+
+        # After solve() has planned for the baseline's layout
+        for t in sim_years:
+            conv = solver.solve_year(reordered, t)
+            assert conv.status == ConvergenceStatus.CONVERGED
+        for state in (baseline_state, reordered):
+            for var in columns:
+                np.testing.assert_array_equal(
+                    state.series(var, sim_years), expected.series(var, sim_years),
+                    err_msg=var,
+                )
+
+    def test_carried_forward_variables_hold_last_value(self, solver, registry, baseline_state):
+        sim_years = baseline_state.sim_years
+        for var in registry.carried_forward:
+            baseline_state.array(var)[1:] += np.arange(len(sim_years))
+        solver.solve(baseline_state, sim_years)
+        for var in registry.carried_forward:
+            row = baseline_state.array(var)
+            np.testing.assert_array_equal(row[1:], row[0])
+
+    def test_precomputed_trends_match_equations(self, registry, scalars, baseline_state):
+        sim_years = baseline_state.sim_years
+        per_year = baseline_state.copy()
+        filled = registry.precompute_pre_phase(baseline_state, scalars, sim_years)
+        assert filled
+        for var in filled:
+            eq = registry.get(var)
+            for t in sim_years:
+                per_year.set(var, t, eq.compute(per_year, t, scalars))
+            np.testing.assert_array_equal(
+                baseline_state.series(var, sim_years), per_year.series(var, sim_years)
+            )
+
+
+class TestVectorizedEquations:
+    def test_compute_vec_matches_compute(self, solver, registry, scalars, baseline_state):
+        """Whole-slice overrides must reproduce the scalar equations exactly."""
+        sim_years = baseline_state.sim_years
+        solver.solve(baseline_state, sim_years)
+        cols = baseline_state.year_slice(sim_years)
+
+        overridden = [
+            eq for eq in registry.all_equations
+            if type(eq).compute_vec is not Equation.compute_vec
+        ]
+        assert overridden
+        for eq in overridden:
+            expected = [eq.compute(baseline_state, t, scalars) for t in sim_years]
+            np.testing.assert_array_equal(
+                eq.compute_vec(baseline_state, cols, scalars), expected, err_msg=eq.name
+            )
+
+    def test_debt_ratio_holds_through_zero_gdp(self, registry, scalars, baseline_state):
+        sim_years = baseline_state.sim_years
+        baseline_state.array("GDPN_")[[2, 3, 6]] = 0.0
+        per_year = baseline_state.copy()
+        eq = registry.get("BR_")
+        vec = eq.compute_vec(baseline_state, baseline_state.year_slice(sim_years), scalars)
+        for t in sim_years:
+            per_year.set("BR_", t, eq.compute(per_year, t, scalars))
+        np.testing.assert_array_equal(vec, per_year.series("BR_", sim_years))
+
+    def test_expressions_match_compute(self, solver, registry, scalars, baseline_state):
+        """Generated code for each equation expression must reproduce compute()."""
+        sim_years = baseline_state.sim_years
+        solver.solve(baseline_state, sim_years)
+
+        with_expr = [eq for eq in registry.all_equations if eq.expression]
+        assert with_expr
+        for eq in with_expr:
+            expected = [eq.compute(baseline_state, t, scalars) for t in sim_years]
+            block = compile_block([eq], baseline_state.row_index, scalars)
+            bound = bind_expression(eq, baseline_state.row_index, scalars)
+            actual, direct = [], []
+            for t in sim_years:
+                # One year at a time, so state[-1] is the solved value as in compute()
+                state = baseline_state.copy()
+                j = state.year_col(t)
+                direct.append(bound.fn(state.values, j))
+                block(state.values, j, j + 1)
+                actual.append(state.get(eq.name, t))
+            np.testing.assert_array_equal(actual, expected, err_msg=eq.name)
+            np.testing.assert_array_equal(direct, expected, err_msg=eq.name)
+
+    def test_deferred_post_phase_matches_per_year(self, solver, registry, baseline_state):
+        sim_years = baseline_state.sim_years
+        per_year = baseline_state.copy()
+        solver.solve(baseline_state, sim_years)
+        for t in sim_years:
+            solver.solve_year(per_year, t)
+
+        for var in registry.post_order:
+            np.testing.assert_array_equal(
+                baseline_state.series(var, sim_years), per_year.series(var, sim_years)
+            )
+
+    def test_kernels_clamp_nan_growth(self):
+        """A NaN growth term (e.g. a missing data year) clamps to +limit; compiled
+        and interpreted kernels agree."""
+        assert cost_deflator_kernel(1.0, 1.0, 1.0, np.nan, 0.5, 0.5, 0.5) == math.exp(0.5)
+
+    def test_fused_inter_matches_sweeps(self, registry, scalars, baseline_state, monkeypatch):
+        sim_years = baseline_state.sim_years
+        swept = baseline_state.copy()
+        fused = GaussSeidelSolver(registry, scalars).solve(baseline_state, sim_years)
+        monkeypatch.setattr(solver_module, "JIT_AVAILABLE", False)
+        python = GaussSeidelSolver(registry, scalars).solve(swept, sim_years)
+
+        assert [(c.iterations, c.status) for c in fused] == [
+            (c.iterations, c.status) for c in python
+        ]
+        np.testing.assert_array_equal(baseline_state.values, swept.values)
+
+
+class TestGeneratedModules:
+    def test_cache_dir_follows_environment(self, monkeypatch, tmp_path):
+        monkeypatch.setenv("ML2_CACHE_DIR", str(tmp_path))
+        assert codegen._cache_dir() == tmp_path
+
+    def test_prune_keeps_most_recently_used(self, tmp_path):
+        (tmp_path / "__pycache__").mkdir()
+        for age, stem in enumerate(["new", "mid", "old"]):
+            module = tmp_path / f"{stem}.py"
+            module.write_text("")
+            (tmp_path / "__pycache__" / f"{stem}.block-6.py311.nbi").write_text("")
+            os.utime(module, (1000 - age, 1000 - age))
+
+        codegen._prune(tmp_path, keep=2)
+        assert sorted(p.name for p in tmp_path.glob("*.py")) == ["mid.py", "new.py"]
+        assert sorted(p.name.partition(".")[0] for p in tmp_path.glob("__pycache__/*")) == [
+            "mid", "new",
+        ]
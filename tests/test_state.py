@@ -0,0 +1,125 @@
+"""Tests for SimulationState storage and operators."""
+
+import numpy as np
+import pytest
+
+from ml2.state import SimulationState
+
+
+class TestCopy:
+    def test_copy_isolates_values(self, baseline_state):
+        t = baseline_state.sim_years[0]
+        original = baseline_state.get("GDP_", t)
+        clone = baseline_state.copy()
+        clone.set("GDP_", t, original * 2)
+        assert baseline_state.get("GDP_", t) == original
+        assert clone.get("GDP_", t) == original * 2
+
+    def test_add_var_on_copy_does_not_leak(self, baseline_state):
+        clone = baseline_state.copy()
+        clone.add_var("NEW_", 1.5)
+        assert clone.has_var("NEW_")
+        assert not baseline_state.has_var("NEW_")
+        assert clone.get("GDP_", clone.years[0]) == baseline_state.get("GDP_", clone.years[0])
+
+    def test_preallocate_adds_only_missing(self, baseline_state):
+        clone = baseline_state.copy()
+        t = clone.years[0]
+        gdp = clone.get("GDP_", t)
+        clone.preallocate(["GDP_", "NEW_", "OTHER_"], {"NEW_": 2.5, "GDP_": -1.0})
+        assert clone.get("GDP_", t) == gdp
+        assert list(clone.array("NEW_")) == [2.5] * len(clone.years)
+        assert clone.get("OTHER_", t) == 0.0
+        assert not baseline_state.has_var("NEW_")
+
+    def test_readonly_rejects_writes(self, baseline_state):
+        view = baseline_state.readonly()
+        t = baseline_state.sim_years[0]
+        assert view.get("GDP_", t) == baseline_state.get("GDP_", t)
+        with pytest.raises(ValueError):
+            view.set("GDP_", t, 0.0)
+        view.copy().set("GDP_", t, 0.0)
+
+
+class TestScalarAccess:
+    def test_get_lag_dln_agree(self, baseline_state):
+        t0, t1 = baseline_state.years[:2]
+        assert baseline_state.lag("GDP_", t1) == baseline_state.get("GDP_", t0)
+        assert baseline_state.array("GDP_")[1] == baseline_state.get("GDP_", t1)
+        assert baseline_state.d("GDP_", t1) == (
+            baseline_state.get("GDP_", t1) - baseline_state.get("GDP_", t0)
+        )
+
+    def test_mavg_clips_to_state_years(self, baseline_state):
+        t0, t1, t2 = baseline_state.years[:3]
+        gdp = [baseline_state.get("GDP_", t) for t in (t0, t1, t2)]
+        assert baseline_state.mavg("GDP_", t2) == pytest.approx(sum(gdp) / 3)
+        assert baseline_state.mavg("GDP_", t1, n=5) == pytest.approx(sum(gdp[:2]) / 2)
+        assert baseline_state.mavg("GDP_", t0 - 1) == 0.0
+
+    def test_reads_before_first_year_raise(self, baseline_state):
+        t0 = baseline_state.years[0]
+        with pytest.raises(KeyError):
+            baseline_state.lag("GDP_", t0)
+        with pytest.raises(KeyError):
+            baseline_state.dln("GDP_", t0)
+
+    def test_years_outside_the_state_raise(self, baseline_state):
+        values = baseline_state.values.copy()
+        for t in (baseline_state.years[0] - 1, baseline_state.years[-1] + 1):
+            with pytest.raises(KeyError):
+                baseline_state.get("GDP_", t)
+            with pytest.raises(KeyError):
+                baseline_state.set("GDP_", t, 123.0)
+        np.testing.assert_array_equal(baseline_state.values, values)
+
+    def test_years_must_be_consecutive(self, baseline_state):
+        df = baseline_state.df.drop(index=baseline_state.years[1])
+        with pytest.raises(ValueError):
+            SimulationState(df)
+
+    def test_from_values_matches_dataframe(self, baseline_state):
+        state = SimulationState.from_values(
+            baseline_state.values, baseline_state.years, baseline_state.columns, np.float32
+        )
+        expected = SimulationState(baseline_state.df, np.float32)
+        assert state.columns == expected.columns
+        assert state.values.dtype == np.float32
+        assert np.array_equal(state.values, expected.values)
+
+
+class TestLagCache:
+    def test_lag_before_first_year_raises_while_cached(self, baseline_state):
+        t0 = baseline_state.years[0]
+        baseline_state.cache_lags_before(t0 + 5)
+        with pytest.raises(KeyError):
+            baseline_state.lag("GDP_", t0 + 1, 3)
+        baseline_state.cache_lags_before(None)
+
+    def test_set_on_earlier_year_invalidates(self, baseline_state):
+        state = baseline_state.copy()
+        t0, t1 = state.sim_years[:2]
+        state.cache_lags_before(t1)
+        assert state.lag("GDP_", t1) == state.get("GDP_", t0)
+        state.set("GDP_", t0, 123.0)
+        assert state.lag("GDP_", t1) == 123.0
+        state.cache_lags_before(None)
+        assert state.lag("GDP_", t1) == 123.0
+
+
+class TestVectorizedOperators:
+    def test_grt_series_matches_grt(self, baseline_state):
+        years = baseline_state.sim_years
+        series = baseline_state.grt_series("GDP_", years)
+        for t, val in zip(years, series):
+            assert val == pytest.approx(baseline_state.grt("GDP_", t))
+
+    def test_series_matches_get(self, baseline_state):
+        years = baseline_state.sim_years
+        series = baseline_state.series("UR_", years)
+        assert list(series) == [baseline_state.get("UR_", t) for t in years]
+
+    def test_to_dict(self, baseline_state):
+        out = baseline_state.to_dict(["GDP_", "MISSING_"])
+        assert list(out) == ["GDP_"]
+        assert out["GDP_"] == {t: baseline_state.get("GDP_", t) for t in baseline_state.years}